@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+
+# Description: builds the book's pages, re-running a page only when its inputs, its script or the lib code it imports changed
+# Example usage:
+#   python build.py
+#   python build.py -pages flux,flux_color
+#   python build.py -dry True
+#   python build.py -mark True
+#   python build.py -procs 4 -heavy 1
+
+import argparse
+import fnmatch
+import glob
+import hashlib
+import imp
+import json
+import multiprocessing
+import os
+import re
+from StringIO import StringIO
+import subprocess
+import sys
+import time
+import traceback
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(ROOT, "lib")
+MANIFEST_FILE = "build/manifest.json"
+
+COLOR_TILES = ["data/%s.png" % c for c in ["white", "yellow", "orange", "red", "brown", "black"]]
+AQI_TILES = ["data/%s.png" % c for c in ["lime", "yellow", "orange", "red", "violet", "brown", "black"]]
+
+# Every page in book order. Paths are relative to the page's directory, which is where its script runs.
+# Inputs may be glob patterns. A page that reads another page's output is built after it.
+# Outputs are the files the book or other pages read; side files such as previews are left out.
+# Heavy pages load large grids or rasters; -heavy limits how many of them run at once.
+# Exploratory scripts such as co2/gridcar.py and flux/flux_fixed.py are not pages and are run by hand.
+PAGES = [
+    {"name": "cover", "dir": "cover", "script": "cover.py", "inputs": ["data/1880-2016_land_ocean.csv"], "outputs": ["data/cover.svg"]},
+    {"name": "temperature", "dir": "temperature", "script": "temperature.py", "inputs": ["data/188001-201612_land_ocean.csv"], "outputs": ["data/188001-201612_land_ocean.svg"]},
+    {"name": "forcings", "dir": "forcings", "script": "forcings.py", "inputs": ["data/forcings.csv", "data/observed.csv"], "outputs": ["data/forcings.svg"]},
+    {"name": "consensus", "dir": "consensus", "script": "consensus.py", "outputs": ["data/consensus_97.svg", "data/consensus_48.svg"]},
+    {"name": "co2", "dir": "co2", "script": "co2.py", "inputs": ["data/global.1751_2014.csv"], "outputs": ["data/co2.svg"]},
+    {"name": "flux_data", "dir": "flux", "script": "nc2csv.py", "heavy": True, "inputs": ["data/CT2015.flux1x1.longterm.nc", "data/land_water.dat"],
+        "outputs": ["data/CT2015_flux1x1_longterm.csv"]},
+    {"name": "flux", "dir": "flux", "script": "flux.py", "heavy": True, "inputs": ["data/CT2015_flux1x1_longterm.csv", "data/USA.geo.json"], "outputs": ["data/flux_USA.svg"]},
+    {"name": "flux_color", "dir": "flux", "script": "flux.py", "heavy": True, "args": ["-color", "True", "-out", "data/flux_%s_color.svg"],
+        "inputs": ["data/CT2015_flux1x1_longterm.csv", "data/USA.geo.json"] + COLOR_TILES, "outputs": ["data/flux_USA_color.svg"]},
+    {"name": "transport", "dir": "transport", "script": "transport.py", "inputs": ["data/emissions_by_mode_of_transport_eea.csv", "svg/*.svg"], "outputs": ["data/transport.svg"]},
+    {"name": "air_pollution", "dir": "air_pollution", "script": "air_pollution.py", "inputs": ["data/Beijing_2015_HourlyPM25_created20160201.csv"], "outputs": ["data/Beijing_2015_DailyPM25.svg"]},
+    {"name": "air_pollution_color", "dir": "air_pollution", "script": "air_pollution.py", "args": ["-color", "True", "-output", "data/Beijing_2015_DailyPM25_color.svg"],
+        "inputs": ["data/Beijing_2015_HourlyPM25_created20160201.csv"] + AQI_TILES, "outputs": ["data/Beijing_2015_DailyPM25_color.svg"]},
+    {"name": "lightbulbs", "dir": "lightbulbs", "script": "lightbulbs.py", "inputs": ["svg/bulb_*.svg"], "outputs": ["data/lightbulbs.svg"]},
+    {"name": "trees", "dir": "equivalence", "script": "trees.py", "inputs": ["svg/tree0*.svg"], "outputs": ["data/trees.svg"]},
+    {"name": "forests", "dir": "equivalence", "script": "forests.py", "inputs": ["svg/pine02.svg"], "outputs": ["data/forests.svg"]},
+    {"name": "wind", "dir": "equivalence", "script": "wind.py", "inputs": ["svg/car*b.svg"], "outputs": ["data/wind.svg"]},
+    {"name": "re_technical", "dir": "re_technical", "script": "re_technical.py",
+        "inputs": ["data/energy_consumption_2016.csv", "data/energy_production_2016.csv", "data/re_technical_potential_summary.csv"], "outputs": ["data/re_actual_potential.svg"]},
+    {"name": "re_map", "dir": "re_map", "script": "re_map.py", "inputs": ["data/us_lng_lats.csv", "data/lat_lng_ghi.csv", "data/lat_lng_wind.csv"],
+        "outputs": ["data/re_map_solar.svg", "data/re_map_wind.svg"]},
+    {"name": "deforestation", "dir": "deforestation", "script": "deforestation.py", "outputs": ["data/deforestation.svg"]},
+    {"name": "deforestation_color", "dir": "deforestation", "script": "deforestation.py", "args": ["-color", "True", "-output", "data/deforestation_color.svg"],
+        "inputs": ["data/lime.png"], "outputs": ["data/deforestation_color.svg"]},
+    {"name": "food_production", "dir": "food_production", "script": "food_production.py",
+        "inputs": ["data/global_food_production_data.csv", "data/population_estimates.csv", "data/population_projections.csv", "svg/man.svg", "svg/woman.svg", "svg/corn_02.svg"],
+        "outputs": ["data/food_production.svg"]},
+    {"name": "sea_ice", "dir": "sea_ice", "script": "sea_ice.py", "heavy": True, "inputs": ["data/extent_N_199609_polygon_v2/*", "data/extent_N_201609_polygon_v2/*"], "outputs": ["data/extent_N_polygon_v2.svg"]},
+    {"name": "ocean", "dir": "ocean", "script": "ocean.py",
+        "inputs": ["data/ocean_temperature_anomalies_188001-201612.csv", "data/slr_sla_gbl_free_txj1j2_90.csv", "data/CSIRO_Recons_gmsl_mo_2015.csv"], "outputs": ["data/ocean.svg"]},
+    {"name": "coral", "dir": "coral", "script": "coral.py", "outputs": ["data/coral.svg"]},
+    {"name": "slr_manhattan", "dir": "slr_manhattan", "script": "slr.py", "heavy": True, "inputs": ["data/slr_*d.png"], "outputs": ["data/manhattan_slr.svg"]},
+    {"name": "slr_manhattan_color", "dir": "slr_manhattan", "script": "slr.py", "heavy": True, "args": ["-color", "True", "-output", "data/manhattan_slr_color.svg"],
+        "inputs": ["data/slr_*d.png", "data/lime.png", "data/red.png"], "outputs": ["data/manhattan_slr_color.svg"]},
+    {"name": "nuisance_data", "dir": "nuisance", "script": "process_data.py",
+        "inputs": ["data/*_MeanSeaLevelTrends.csv", "data/*_InundationAnalysis.csv", "data/nuisance_flood_levels.csv"], "outputs": ["data/nuisance.json"]},
+    {"name": "nuisance", "dir": "nuisance", "script": "nuisance.py", "inputs": ["data/nuisance.json"], "outputs": ["data/nuisance.svg"]},
+    {"name": "typhoons", "dir": "typhoons", "script": "typhoons.py", "inputs": ["data/typhoons.csv"], "outputs": ["data/typhoons.svg"]},
+    {"name": "back_cover", "dir": "back_cover", "script": "back_cover.py", "inputs": ["data/slr_sla_gbl_free_txj1j2_90.csv"], "outputs": ["data/back_cover.svg"]},
+    {"name": "thank_you", "dir": "thank-you", "script": "thank-you.py", "inputs": ["badge.svg"], "outputs": ["thank-you.svg"]}
+]
+
+IMPORT_PATTERN = re.compile(r"^\s*(?:import|from)\s+([\w\.]+)", re.M)
+
+def relPath(filename):
+    return os.path.relpath(filename, ROOT)
+
+def pagePath(page, filename):
+    return relPath(os.path.join(ROOT, page["dir"], filename))
+
+def moduleFiles(filename, found=None):
+    # the script plus the lib modules and sibling modules it imports, followed recursively
+    if found is None:
+        found = set()
+    if filename in found:
+        return found
+    found.add(filename)
+    directory = os.path.dirname(os.path.join(ROOT, filename))
+    with open(os.path.join(ROOT, filename)) as f:
+        names = IMPORT_PATTERN.findall(f.read())
+    for name in names:
+        parts = name.split(".")
+        if parts[0] == "lib" and len(parts) > 1:
+            base = LIB_DIR
+            parts = parts[1:]
+        else:
+            base = directory
+        module = os.path.join(base, parts[0])
+        if os.path.isdir(module) and os.path.isfile(os.path.join(module, "__init__.py")):
+            for f in sorted(glob.glob(os.path.join(module, "*.py"))):
+                moduleFiles(relPath(f), found)
+        elif os.path.isfile(module + ".py"):
+            moduleFiles(relPath(module + ".py"), found)
+    return found
+
+def pageInputs(page):
+    """Input files relative to the root; a pattern that matches nothing is kept so it shows as missing"""
+    inputs = []
+    for pattern in page.get("inputs", []):
+        matches = sorted(glob.glob(os.path.join(ROOT, page["dir"], pattern)))
+        if not len(matches):
+            inputs.append(pagePath(page, pattern))
+            continue
+        inputs += [relPath(m) for m in matches if os.path.isfile(m)]
+    return inputs
+
+def pageOutputs(page):
+    return [pagePath(page, o) for o in page["outputs"]]
+
+def dependencies(pages):
+    # pages that produce each page's inputs
+    producers = {}
+    for page in pages:
+        for o in pageOutputs(page):
+            producers[o] = page["name"]
+    deps = {}
+    for page in pages:
+        deps[page["name"]] = []
+        for pattern in page.get("inputs", []):
+            path = pagePath(page, pattern)
+            for o, name in producers.items():
+                if name != page["name"] and (o == path or fnmatch.fnmatch(o, path)) and name not in deps[page["name"]]:
+                    deps[page["name"]].append(name)
+    return deps
+
+def buildOrder(pages, names=None):
+    """Pages in book order, each after the pages it depends on; names limits it to those pages and what they need"""
+    deps = dependencies(pages)
+    byName = dict([(p["name"], p) for p in pages])
+    order = []
+    visiting = set()
+    def visit(name):
+        if name in order:
+            return
+        if name in visiting:
+            raise ValueError("Dependency cycle at page %s" % name)
+        visiting.add(name)
+        for dep in deps[name]:
+            visit(dep)
+        visiting.remove(name)
+        order.append(name)
+    for page in pages:
+        if names is None or page["name"] in names:
+            visit(page["name"])
+    return [byName[name] for name in order]
+
+class FileHashes(object):
+
+    # sha1 of files, reusing the last hash while a file's mtime and size are unchanged
+    def __init__(self, known=None):
+        self.known = known or {}
+
+    def get(self, filename):
+        path = os.path.join(ROOT, filename)
+        if not os.path.isfile(path):
+            return None
+        stat = os.stat(path)
+        entry = self.known.get(filename)
+        if entry and entry[0] == stat.st_mtime and entry[1] == stat.st_size:
+            return entry[2]
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024*1024), b""):
+                h.update(chunk)
+        self.known[filename] = [stat.st_mtime, stat.st_size, h.hexdigest()]
+        return self.known[filename][2]
+
+def readManifest(filename=MANIFEST_FILE):
+    path = os.path.join(ROOT, filename)
+    if not os.path.isfile(path):
+        return {"pages": {}, "files": {}}
+    with open(path) as f:
+        return json.load(f)
+
+def writeManifest(manifest, filename=MANIFEST_FILE):
+    path = os.path.join(ROOT, filename)
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+def pageState(page, hashes):
+    """Hashes of everything a page is built from, and the key they make up together"""
+    inputs = dict([(f, hashes.get(f)) for f in pageInputs(page)])
+    code = dict([(f, hashes.get(f)) for f in moduleFiles(pagePath(page, page["script"]))])
+    h = hashlib.sha1(json.dumps([page["script"], page.get("args", []), sorted(inputs.items()), sorted(code.items())]))
+    return {"inputs": inputs, "code": code, "key": h.hexdigest()}
+
+def pageStatus(page, state, record, hashes):
+    """Why a page needs building, or None if it is up to date"""
+    missing = [f for f, h in state["inputs"].items() if h is None]
+    if len(missing):
+        return "missing input %s" % ", ".join(sorted(missing))
+    if not record:
+        return "never built"
+    if record.get("status") != "built":
+        return "last build failed"
+    if record.get("key") != state["key"]:
+        changed = [f for f, h in sorted(state["inputs"].items() + state["code"].items()) if record["inputs"].get(f, record["code"].get(f)) != h]
+        return "changed %s" % ", ".join(changed) if len(changed) else "changed arguments"
+    for o in pageOutputs(page):
+        if hashes.get(o) is None:
+            return "missing output %s" % o
+    return None
+
+def stalePages(filename=MANIFEST_FILE, pages=PAGES):
+    """Names of pages that are not up to date according to a build manifest, with the reason"""
+    manifest = readManifest(filename)
+    hashes = FileHashes(manifest.get("files", {}))
+    stale = []
+    for page in buildOrder(pages):
+        status = pageStatus(page, pageState(page, hashes), manifest["pages"].get(page["name"]), hashes)
+        if status:
+            stale.append((page["name"], status))
+    return stale
+
+# pages whose script defines build(config) are called in a worker that stays warm across pages
+BUILD_PATTERN = re.compile(r"^def build\(", re.M)
+# page modules loaded in this process
+MODULES = {}
+
+def hasBuild(page):
+    with open(os.path.join(ROOT, page["dir"], page["script"])) as f:
+        return BUILD_PATTERN.search(f.read()) is not None
+
+def loadPage(page):
+    path = os.path.join(ROOT, page["dir"], page["script"])
+    # page scripts only add the root to sys.path when run as scripts
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    if path not in MODULES:
+        name = "page_" + re.sub(r"\W", "_", os.path.splitext(relPath(path))[0])
+        MODULES[path] = imp.load_source(name, path)
+    return MODULES[path]
+
+def callPage(page):
+    """Calls a page's build() in this process from the page's directory, with the page's arguments parsed by its own parser"""
+    output = StringIO()
+    cwd = os.getcwd()
+    (stdout, stderr) = (sys.stdout, sys.stderr)
+    returncode = 0
+    start = time.time()
+    try:
+        os.chdir(os.path.join(ROOT, page["dir"]))
+        sys.stdout = sys.stderr = output
+        module = loadPage(page)
+        module.build(vars(module.parser.parse_args(page.get("args", []))))
+    except SystemExit as e:
+        returncode = e.code if isinstance(e.code, int) else 1
+    except Exception:
+        traceback.print_exc(file=output)
+        returncode = 1
+    finally:
+        (sys.stdout, sys.stderr) = (stdout, stderr)
+        os.chdir(cwd)
+    return (returncode, time.time() - start, output.getvalue())
+
+def runPage(page, fresh=False):
+    """Builds a page; returns its exit code, seconds taken and everything it printed"""
+    if not fresh and hasBuild(page):
+        return callPage(page)
+    command = [sys.executable, page["script"]] + page.get("args", [])
+    start = time.time()
+    process = subprocess.Popen(command, cwd=os.path.join(ROOT, page["dir"]), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = process.communicate()[0]
+    return (process.returncode, time.time() - start, output)
+
+def build(names=None, force=False, dry=False, mark=False, manifestFile=MANIFEST_FILE, pages=PAGES, processes=1, maxHeavy=0, fresh=False):
+    """Builds pages that are out of date, running up to processes scripts at once and at most maxHeavy heavy
+    ones (0 for no limit). Each page's output is printed in build order once it and the pages before it are done."""
+    manifest = readManifest(manifestFile)
+    hashes = FileHashes(manifest.get("files", {}))
+    deps = dependencies(pages)
+    order = buildOrder(pages, names)
+    pending = list(order)
+    running = {}
+    logs = {}
+    failed = []
+    built = []
+    timings = []
+    printed = 0
+    pool = None
+    if processes > 1 and not dry and not mark:
+        pool = multiprocessing.Pool(processes)
+
+    def finish(page, state, result):
+        (returncode, seconds, output) = result
+        name = page["name"]
+        logs[name].append(output.rstrip())
+        timings.append((name, seconds))
+        if returncode != 0:
+            logs[name].append("%s: failed with exit code %s" % (name, returncode))
+            manifest["pages"][name] = dict(state, status="failed", seconds=round(seconds, 3))
+            failed.append(name)
+            return
+        outputs = dict([(o, hashes.get(o)) for o in pageOutputs(page)])
+        manifest["pages"][name] = dict(state, status="built", outputs=outputs, seconds=round(seconds, 3), built=time.strftime("%Y-%m-%d %H:%M:%S"))
+        built.append(name)
+        logs[name].append("%s: built in %.1fs" % (name, seconds))
+
+    while len(pending) or len(running):
+        waiting = set([p["name"] for p in pending] + running.keys())
+        for page in list(pending):
+            name = page["name"]
+            if len([d for d in deps[name] if d in waiting]):
+                continue
+            blocked = [d for d in deps[name] if d in failed]
+            if len(blocked):
+                pending.remove(page)
+                logs[name] = ["%s: skipped, needs %s" % (name, ", ".join(blocked))]
+                failed.append(name)
+                continue
+            # dependencies are built by now, so their outputs hash as they will be read
+            state = pageState(page, hashes)
+            status = pageStatus(page, state, manifest["pages"].get(name), hashes)
+            if status is None and not force:
+                pending.remove(page)
+                logs[name] = ["%s: up to date" % name]
+                continue
+            if status and status.startswith("missing input"):
+                pending.remove(page)
+                logs[name] = ["%s: %s" % (name, status)]
+                failed.append(name)
+                continue
+            if dry or mark:
+                pending.remove(page)
+                logs[name] = ["%s: %s" % (name, status or "forced")]
+                if mark:
+                    # a page without its outputs would stay stale and block the pages after it
+                    missing = [o for o in pageOutputs(page) if hashes.get(o) is None]
+                    if len(missing):
+                        logs[name].append("%s: not marked, missing output %s" % (name, ", ".join(missing)))
+                        failed.append(name)
+                    else:
+                        finish(page, state, (0, 0, ""))
+                continue
+            heavy = len([n for n, r in running.items() if r[0].get("heavy")])
+            if len(running) >= processes or (page.get("heavy") and maxHeavy > 0 and heavy >= maxHeavy):
+                continue
+            pending.remove(page)
+            logs[name] = ["%s: %s" % (name, status or "forced")]
+            if pool is None:
+                finish(page, state, runPage(page, fresh))
+            else:
+                running[name] = (page, state, pool.apply_async(runPage, (page, fresh)))
+
+        for name, (page, state, result) in running.items():
+            if result.ready():
+                del running[name]
+                finish(page, state, result.get())
+
+        while printed < len(order) and order[printed]["name"] in logs and order[printed]["name"] not in running:
+            for line in logs[order[printed]["name"]]:
+                if len(line):
+                    print line
+            printed += 1
+        sys.stdout.flush()
+        if len(running):
+            time.sleep(0.05)
+
+    if pool is not None:
+        pool.close()
+        pool.join()
+    if not dry:
+        manifest["files"] = hashes.known
+        manifest["order"] = [p["name"] for p in buildOrder(pages)]
+        writeManifest(manifest, manifestFile)
+    if len(timings):
+        print "Timings:"
+        names = [p["name"] for p in order]
+        for name, seconds in sorted(timings, key=lambda t: names.index(t[0])):
+            print "  %s: %.1fs" % (name, seconds)
+    print "%s built, %s failed" % (len(built), len(failed))
+    return (built, failed)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-pages', dest="PAGES", default="", help="Comma-separated list of pages to build, with the pages they need; all by default")
+    parser.add_argument('-force', dest="FORCE", type=bool, default=False, help="Rebuild pages even if they are up to date")
+    parser.add_argument('-dry', dest="DRY", type=bool, default=False, help="Only list pages that would be built")
+    parser.add_argument('-mark', dest="MARK", type=bool, default=False, help="Record pages as built without running them, e.g. after building them by hand")
+    parser.add_argument('-procs', dest="PROCESSES", type=int, default=multiprocessing.cpu_count(), help="Number of pages to build at once")
+    parser.add_argument('-heavy', dest="MAX_HEAVY", type=int, default=0, help="Most memory-heavy pages to build at once; 0 for no limit")
+    parser.add_argument('-fresh', dest="FRESH", type=bool, default=False, help="Run every page script in a new interpreter, even pages that define build()")
+    parser.add_argument('-manifest', dest="MANIFEST_FILE", default=MANIFEST_FILE, help="Path to the build manifest, relative to this directory")
+    args = parser.parse_args()
+
+    names = None
+    if len(args.PAGES):
+        names = args.PAGES.split(",")
+        unknown = [n for n in names if n not in [p["name"] for p in PAGES]]
+        if len(unknown):
+            print "Unknown page(s): %s" % ", ".join(unknown)
+            sys.exit(1)
+    (built, failed) = build(names, args.FORCE, args.DRY, args.MARK, args.MANIFEST_FILE, processes=args.PROCESSES, maxHeavy=args.MAX_HEAVY, fresh=args.FRESH)
+    if len(failed):
+        sys.exit(1)
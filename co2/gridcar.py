@@ -1,54 +1,131 @@
 # -*- coding: utf-8 -*-
 
+# Usage:
+#   python gridcar.py
+#   python gridcar.py -y0 1950 -y1 2013
+#   python gridcar.py -rebuild True
+
 import argparse
+import glob
+import json
 import math
-from PIL import Image
-import svgwrite
+import numpy as np
+import os
+import sys
+
+# add parent directory to sys path to import relative modules when run as a script
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lib.imageutils as iu
 
 # input
 parser = argparse.ArgumentParser()
 parser.add_argument('-in', dest="INPUT_FILE", default="gridcar/gridcar.%s", help="Input file pattern")
+parser.add_argument('-cube', dest="CUBE_FILE", default="gridcar/gridcar.cube", help="Binary year x lat x lon cube built from the input files")
+parser.add_argument('-rebuild', dest="REBUILD", type=bool, default=False, help="Force re-ingesting the input files into the cube")
 parser.add_argument('-y0', dest="START_YEAR", type=int, default=2001, help="Start year")
 parser.add_argument('-y1', dest="END_YEAR", type=int, default=2013, help="End year")
-parser.add_argument('-out', dest="OUTPUT_FILE", default="data/co2.svg", help="Path to output svg file")
+parser.add_argument('-ramp', dest="RAMP", default="red", help="Color ramp: red, gray, heat, green")
+parser.add_argument('-out', dest="OUTPUT_FILE", default="data/gridcar_%s_%s.png", help="Path to output png file")
 
 lats = 180
 lons = 360
 area = lats * lons
 
-args = parser.parse_args()
-START_YEAR = args.START_YEAR
-END_YEAR = args.END_YEAR
-years = END_YEAR - START_YEAR + 1
-
-def mean(data):
-    size = len(data)
-    if size <= 0:
-        return 0
-    return sum(data) / size
-
-values = [[] for v in range(area)]
-for y in range(years):
-    year = START_YEAR + y
-    filename = args.INPUT_FILE % year
-    yearValues = [float(line.strip())*1000000 for line in open(filename)]
-    for i, v in enumerate(yearValues):
-        values[i].append(v)
-values = [mean(vs) for vs in values]
-
-maxValue = max(values)
-print "Max value: %s" % maxValue
-
-im = Image.new("RGB", (lons, lats))
-w = lons
-h = lats
-pixeldata = [(0,0,0) for n in range(len(values))]
-for y in range(lats):
-    for x in range(lons):
-        i = y * w + x
-        value = int(values[i] / maxValue * 255)
-        if values[i] > 0 and value < 1:
-            value = 1
-        pixeldata[i] = (value,0,0)
-im.putdata(pixeldata)
-im.show()
+def availableYears(pattern):
+    years = []
+    for filename in glob.glob(pattern % "*"):
+        suffix = filename.split(".")[-1]
+        if suffix.isdigit():
+            years.append(int(suffix))
+    return sorted(years)
+
+def inputStats(pattern):
+    # modification time and size of each input file, so a changed file rebuilds the cube
+    stats = {}
+    for year in availableYears(pattern):
+        yearFile = pattern % year
+        stat = os.stat(yearFile)
+        stats[yearFile] = [stat.st_mtime, stat.st_size]
+    return stats
+
+# One-time ingest: parse every yearly text file into a float32 memory-mapped cube (years x lats x lons)
+def buildCube(pattern, filename, headerFilename):
+    years = availableYears(pattern)
+    if not len(years):
+        raise Exception("No input files found for %s" % pattern)
+    firstYear = years[0]
+    lastYear = years[-1]
+    count = lastYear - firstYear + 1
+    cube = np.memmap(filename, dtype=np.float32, mode="w+", shape=(count, lats, lons))
+    for i in range(count):
+        year = firstYear + i
+        yearFile = pattern % year
+        if not os.path.isfile(yearFile):
+            raise Exception("Missing input file %s" % yearFile)
+        with open(yearFile) as f:
+            yearValues = np.fromstring(f.read(), dtype=np.float64, sep=" ")
+        if len(yearValues) != area:
+            raise Exception("Expected %s values in %s, found %s" % (area, yearFile, len(yearValues)))
+        cube[i] = yearValues.reshape(lats, lons)
+    cube.flush()
+    del cube
+    header = {
+        "firstYear": firstYear,
+        "lastYear": lastYear,
+        "lats": lats,
+        "lons": lons,
+        "dtype": "float32",
+        "pattern": pattern,
+        "files": inputStats(pattern)
+    }
+    with open(headerFilename, "w") as f:
+        json.dump(header, f, indent=2)
+    print "Ingested %s years (%s-%s) into %s" % (count, firstYear, lastYear, filename)
+    return header
+
+def readHeader(headerFilename):
+    if not os.path.isfile(headerFilename):
+        return None
+    with open(headerFilename) as f:
+        return json.load(f)
+
+def isStale(header, pattern, cubeFilename, startYear, endYear):
+    if header is None or not os.path.isfile(cubeFilename):
+        return True
+    # a different input pattern or any added, removed or changed input file
+    if header.get("pattern") != pattern or header.get("files") != inputStats(pattern):
+        return True
+    return startYear < header["firstYear"] or endYear > header["lastYear"]
+
+def build(config=None):
+    args = parser.parse_args([])
+    args.__dict__.update(config or {})
+    START_YEAR = args.START_YEAR
+    END_YEAR = args.END_YEAR
+    CUBE_FILE = args.CUBE_FILE
+    HEADER_FILE = CUBE_FILE + ".json"
+
+    header = readHeader(HEADER_FILE)
+    if args.REBUILD or isStale(header, args.INPUT_FILE, CUBE_FILE, START_YEAR, END_YEAR):
+        header = buildCube(args.INPUT_FILE, CUBE_FILE, HEADER_FILE)
+
+    if START_YEAR < header["firstYear"] or END_YEAR > header["lastYear"]:
+        raise Exception("Year range %s-%s is outside of available data %s-%s" % (START_YEAR, END_YEAR, header["firstYear"], header["lastYear"]))
+
+    # slice the requested years without copying, then average across years
+    count = header["lastYear"] - header["firstYear"] + 1
+    cube = np.memmap(CUBE_FILE, dtype=header["dtype"], mode="r", shape=(count, header["lats"], header["lons"]))
+    yearSlice = cube[(START_YEAR - header["firstYear"]):(END_YEAR - header["firstYear"] + 1)]
+    values = yearSlice.mean(axis=0, dtype=np.float64) * 1000000
+
+    maxValue = values.max()
+    print "Max value: %s" % maxValue
+
+    filename = args.OUTPUT_FILE % (START_YEAR, END_YEAR)
+    iu.saveGridImage(filename, values, ramp=args.RAMP, maxValue=maxValue, visibleMin=True)
+    return [filename]
+
+if __name__ == "__main__":
+    build(vars(parser.parse_args()))
@@ -5,53 +5,50 @@
 #   python flux.py -color True -out data/flux_%s_color.svg
 #   python flux.py -geo data/CHN.geo.json -color True -out data/flux_%s_color.svg -proj Asia
 #   python flux.py -geo data/BRA.geo.json -color True -out data/flux_%s_color.svg -proj SA
+#   python flux.py -regions data/USA.geo.json:USA,data/CHN.geo.json:Asia,data/BRA.geo.json:SA -color True -out data/flux_%s_color.svg -procs 3
 
 # Data source:
 # https://www.esrl.noaa.gov/gmd/ccgg/carbontracker/fluxes.php
 
 import argparse
-import base64
 from collections import Counter
-import csv
-import inspect
-import json
 import math
 import matplotlib.pyplot as plt
+import multiprocessing
 import numpy as np
 import os
-from pyproj import Proj
 from scipy.cluster.vq import kmeans, vq
-import svgwrite
 import sys
 
-# add parent directory to sys path to import relative modules
-currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
-parentdir = os.path.dirname(currentdir)
-sys.path.insert(0,parentdir)
+# add parent directory to sys path to import relative modules when run as a script
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import lib.geoutils as gu
 import lib.mathutils as mu
+import lib.patterns as pat
+import lib.projection as proj
+import lib.svgstream as svgs
 
 # input
 parser = argparse.ArgumentParser()
 parser.add_argument('-in', dest="INPUT_FILE", default="data/CT2015_flux1x1_longterm.csv", help="Input data file")
+parser.add_argument('-var', dest="VARIABLE", default="fossil_flux_imp", help="Variable to read when input is a .npz grid")
+parser.add_argument('-time', dest="TIME_INDEX", type=int, default=0, help="Time step to read when input is a .npz grid")
 parser.add_argument('-geo', dest="GEO_FILE", default="data/USA.geo.json", help="Input geojson file")
 parser.add_argument('-width', dest="WIDTH", type=float, default=11, help="Width of output file")
 parser.add_argument('-height', dest="HEIGHT", type=float, default=8.5, help="Height of output file")
 parser.add_argument('-pad', dest="PAD", type=float, default=0.5, help="Padding of output file")
 parser.add_argument('-color', dest="SHOW_COLOR", type=bool, default=False, help="Whether or not to display color")
+parser.add_argument('-patterns', dest="PATTERN_MODE", default="inline", help="How color pattern tiles are included: inline, href (link to the png), downsample, generate (from palette/colors.json) or vector")
+parser.add_argument('-pcache', dest="PATTERN_CACHE", default="data/.patterncache", help="Directory for cached pattern tiles; empty to disable")
+parser.add_argument('-tiledpi', dest="TILE_DPI", type=float, default=72, help="Resolution of generated pattern tiles")
 parser.add_argument('-proj', dest="PROJECTION", default="USA", help="For projection parameters: USA, Asia, Europe, SA")
+parser.add_argument('-regions', dest="REGIONS", default="", help="Comma-separated list of geo file:projection pairs to render in one run; overrides -geo and -proj")
+parser.add_argument('-procs', dest="PROCESSES", type=int, default=1, help="Number of worker processes used to render regions")
 parser.add_argument('-out', dest="OUTPUT_FILE", default="data/flux_%s.svg", help="Path to output svg file")
 
-# init input
-args = parser.parse_args()
 DPI = 72
-PAD = args.PAD * DPI
-WIDTH = args.WIDTH * DPI - PAD * 2
-HEIGHT = args.HEIGHT * DPI - PAD * 2
-SHOW_COLOR = args.SHOW_COLOR
-PROJECTION = args.PROJECTION
-Y_OFFSET = 0.1 * HEIGHT
 LATS = 180
 LONS = 360
 CELL_PAD_X = 0.4
@@ -66,17 +63,6 @@ GROUPS = [
     {"key": "6", "min": 1000, "label": "Over 1000 metric tons", "color": "#7c139e", "image": "data/black.png"}
 ]
 
-# Specify the parameters of the Regional Conformal spatial ref.system using Lambert's Conformal Conic projection method
-# Format: [central meridian, latitude or origin, 1st standard parallel, 2nd standard parallel, false easting, false northing]
-PROJ_PARAMS = {
-    "USA": ['-96.0','39.0','33.0','45.0','0.0','0.0'],
-    "Asia": ['105.0','0.0','30.0','62.0','0.0','0.0'],
-    "Europe": ['10.0','30.0','43.0','62.0','0.0','0.0'],
-    "SA": ['-60.0','-32.0','-5.0','-42.0','0.0','0.0']
-}
-proj = PROJ_PARAMS[PROJECTION]
-lccProj = Proj(ellps='GRS80',proj='lcc',lon_0=proj[0],lat_0=proj[1],lat_1=proj[2],lat_2=proj[3],x_0=proj[4],y_0=proj[5])
-
 def getGroup(value, groups):
     group = None
     for g in groups:
@@ -85,18 +71,22 @@ def getGroup(value, groups):
         group = g
     return group
 
-data = []
-# read csv
-with open(args.INPUT_FILE, 'rb') as f:
-    r = csv.reader(f, delimiter=',')
-    # skip header
-    next(r, None)
+# valid data points by input file, variable and time step with the file's mtime and size, read again when the file changes
+DATA = {}
+
+def readData(filename, variable, timeIndex=0):
+    key = (os.path.abspath(filename), variable, timeIndex)
+    stat = os.stat(filename)
+    stamp = (stat.st_mtime, stat.st_size)
+    if key in DATA and DATA[key][0] == stamp:
+        return DATA[key][1]
+    allData = []
     # put data in matrix
     i = 0
-    for _lat, _lon, _value in r:
+    for _lat, _lon, _value in gu.readGridRows(filename, variable, timeIndex):
         v = float(_value)
         if v >= 0:
-            data.append({
+            allData.append({
                 "index": i,
                 "lat": float(_lat),
                 "lon": float(_lon),
@@ -105,143 +95,160 @@ with open(args.INPUT_FILE, 'rb') as f:
                 "value": v
             })
         i += 1
-print "%s valid data points found" % len(data)
-
-# retrieve geo coordinates
-geodata = {}
-with open(args.GEO_FILE) as f:
-    geodata = json.load(f)
-coordinates = []
-for feature in geodata["features"]:
-    t = feature["geometry"]["type"]
-    gcoordinates = feature["geometry"]["coordinates"]
-    if t == "MultiPolygon":
-        gcoordinates = sorted(gcoordinates, key=lambda c: -1*len(c[0]))
-    else:
-        gcoordinates = sorted(gcoordinates, key=lambda c: -1*len(c))
-    for coordinate in gcoordinates:
-        if t == "MultiPolygon":
-            coordinates.append(coordinate[0])
-        else:
-            coordinates.append(coordinate)
-        break # only show biggest shape
-
-# only use data that's within coordinates
-data = [d for d in data if gu.withinCoordinates(coordinates, (d["lon"], d["lat"]))]
-print "%s data points found in %s" % (len(data), args.GEO_FILE)
-
-# flatten coordinates
-flattenedCoordinates = []
-for coords in coordinates:
-    for p in coords:
-        flattenedCoordinates.append(p)
-
-# project lon,lat using LCC
-for i,d in enumerate(data):
-    x,y = lccProj(d["lon"], d["lat"])
-    data[i]["x"] = x
-    data[i]["y"] = y
-
-# get x,y bounds
-xs = [d["x"] for d in data]
-ys = [d["y"] for d in data]
-xBound = (min(xs), max(xs))
-yBound = (max(ys), min(ys))
-
-# normalize x,y
-for i,d in enumerate(data):
-    data[i]["xn"] = mu.norm(d["x"], xBound[0], xBound[1])
-    data[i]["yn"] = mu.norm(d["y"], yBound[0], yBound[1])
-
-# get bounds, ratio
-bounds = gu.getBounds(flattenedCoordinates)
-print "Bounds: (%s, %s) (%s, %s)" % bounds
-(rw, rh) = gu.getRatio(flattenedCoordinates)
-print "Ratio: %s x %s" % (rw, rh)
-
-# add groups
-for i, d in enumerate(data):
-    data[i]["group"] = getGroup(d["value"], GROUPS)
-
-# give groups stats
-groupValues = [d["group"]["key"] for d in data]
-C = Counter(groupValues)
-print "Group stats:"
-for k,v in C.items():
-    print "Group: %s, Size: %s" % (k, v)
-
-# get the bounds
-cols = [d["col"] for d in data]
-minCols = min(cols)
-maxCols = max(cols)
-colDiff = maxCols - minCols
-rows = [d["row"] for d in data]
-minRows = min(rows)
-maxRows = max(rows)
-rowDiff = maxRows - minRows
-# normalize row/col
-for i, d in enumerate(data):
-    data[i]["row"] = d["row"] - minRows
-    data[i]["col"] = d["col"] - minCols
-
-# calculate dimensions
-
-width = 1.0 * WIDTH
-height = width * rh / rw
-cellW = width / (colDiff+1)
-cellH = height / (rowDiff+1)
-innerWidth = width - cellW
-innerHeight = height - cellH
-halfW = cellW * 0.5 - CELL_PAD_X
-halfH = cellH * 0.5 - CELL_PAD_Y
-offsetX = PAD
-offsetY = PAD + (HEIGHT - height) * 0.667
-
-# init svg
-prefix = args.GEO_FILE.split("/")[1].split(".")[0]
-filename = args.OUTPUT_FILE % prefix
-dwg = svgwrite.Drawing(filename, size=(WIDTH+PAD*2, HEIGHT+PAD*2), profile='full')
-
-# define color patterns
-if SHOW_COLOR:
-    for g in GROUPS:
-        imageSize = (300, 300)
-        imageData = ""
-        with open(g["image"], "rb") as f:
-            imageData = base64.b64encode(f.read())
-        dwgImage = dwg.image(href="data:image/png;base64,%s" % imageData, insert=(0, 0), size=imageSize)
-        dwgPattern = dwg.pattern(id="pattern%s" % g["key"], patternUnits="userSpaceOnUse", size=imageSize)
-        dwgPattern.add(dwgImage)
-        dwg.defs.add(dwgPattern)
-
-# add cells and labels
-cellsGroup = dwg.add(dwg.g(id="cells"))
-labelsGroup = dwg.add(dwg.g(id="labels"))
-labelsGroups = {}
-for g in GROUPS:
-    labelsGroups[g["key"]] = labelsGroup.add(dwg.g(id="labels%s" % g["key"]))
-for d in data:
-    # Mercator proj
-    # (x, y) = gu.coordinateToPixel((d["lon"], d["lat"]), width, height, bounds)
-
-    # No proj
-    # x = d["col"] * cellW + offsetX
-    # y = d["row"] * cellH + offsetY
-
-    # LCC proj
-    x = d["xn"] * innerWidth + offsetX
-    y = d["yn"] * innerHeight + offsetY
-    color = "none"
+    print "%s valid data points found" % len(allData)
+    DATA[key] = (stamp, allData)
+    return allData
+
+def makeMap(region, args):
+    (geoFile, projection) = region
+    PAD = args.PAD * DPI
+    WIDTH = args.WIDTH * DPI - PAD * 2
+    HEIGHT = args.HEIGHT * DPI - PAD * 2
+    SHOW_COLOR = args.SHOW_COLOR
+    allData = readData(args.INPUT_FILE, args.VARIABLE, args.TIME_INDEX)
+
+    # color patterns are encoded once per process
+    patternImages = {}
     if SHOW_COLOR:
-        # color = d["group"]["color"]
-        color = "url(#pattern%s)" % d["group"]["key"]
-    # cellsGroup.add(dwg.rect(insert=(x, y), size=(cellW, cellH), fill=color, stroke="#000000", stroke_width=1))
-    cellsGroup.add(dwg.ellipse(center=(x+halfW, y+halfH), r=(halfW, halfH), fill=color, stroke="#000000", stroke_width=1))
-    labelsGroups[d["group"]["key"]].add(dwg.text(d["group"]["key"], insert=(x+halfW, y+halfH), text_anchor="middle", alignment_baseline="middle", font_size=11))
+        for g in GROUPS:
+            patternImages[g["key"]] = pat.getPatternHref(g["image"], args.PATTERN_MODE, args.OUTPUT_FILE, args.PATTERN_CACHE, dpi=args.TILE_DPI)
+
+    # retrieve geo coordinates
+    coordinates = gu.getGeoCoordinates(geoFile)
+
+    # only use data that's within coordinates; copy since entries are modified per region
+    mask = gu.regionMask(geoFile, LATS, LONS).ravel()
+    data = [d.copy() for d in allData if mask[d["index"]]]
+    print "%s data points found in %s" % (len(data), geoFile)
+
+    # flatten coordinates
+    flattenedCoordinates = []
+    for coords in coordinates:
+        for p in coords:
+            flattenedCoordinates.append(p)
+
+    # project lon,lat using LCC and normalize x,y
+    (xns, yns) = proj.projectNormalized([d["lon"] for d in data], [d["lat"] for d in data], projection)
+    for i, (xn, yn) in enumerate(zip(xns.tolist(), yns.tolist())):
+        data[i]["xn"] = xn
+        data[i]["yn"] = yn
+
+    # get bounds, ratio
+    bounds = gu.getBounds(flattenedCoordinates)
+    print "Bounds: (%s, %s) (%s, %s)" % bounds
+    (rw, rh) = gu.getRatio(flattenedCoordinates)
+    print "Ratio: %s x %s" % (rw, rh)
+
+    # add groups
+    for i, d in enumerate(data):
+        data[i]["group"] = getGroup(d["value"], GROUPS)
+
+    # give groups stats
+    groupValues = [d["group"]["key"] for d in data]
+    C = Counter(groupValues)
+    print "Group stats:"
+    for k,v in C.items():
+        print "Group: %s, Size: %s" % (k, v)
+
+    # get the bounds
+    cols = [d["col"] for d in data]
+    minCols = min(cols)
+    maxCols = max(cols)
+    colDiff = maxCols - minCols
+    rows = [d["row"] for d in data]
+    minRows = min(rows)
+    maxRows = max(rows)
+    rowDiff = maxRows - minRows
+    # normalize row/col
+    for i, d in enumerate(data):
+        data[i]["row"] = d["row"] - minRows
+        data[i]["col"] = d["col"] - minCols
+
+    # calculate dimensions
 
-dwg.add(dwg.rect(insert=(PAD,PAD), size=(WIDTH, HEIGHT), stroke_width=1, stroke="#000000", fill="none"))
-dwg.save()
-print "Saved svg: %s" % filename
+    width = 1.0 * WIDTH
+    height = width * rh / rw
+    cellW = width / (colDiff+1)
+    cellH = height / (rowDiff+1)
+    innerWidth = width - cellW
+    innerHeight = height - cellH
+    halfW = cellW * 0.5 - CELL_PAD_X
+    halfH = cellH * 0.5 - CELL_PAD_Y
+    offsetX = PAD
+    offsetY = PAD + (HEIGHT - height) * 0.667
+
+    # init svg
+    prefix = os.path.basename(geoFile).split(".")[0]
+    filename = args.OUTPUT_FILE % prefix
+    svg = svgs.SVGStream(filename, size=(WIDTH+PAD*2, HEIGHT+PAD*2))
+
+    # define color patterns
+    with svg.defs():
+        if SHOW_COLOR:
+            for g in GROUPS:
+                imageSize = (300, 300)
+                with svg.pattern(id="pattern%s" % g["key"], patternUnits="userSpaceOnUse", size=imageSize):
+                    svg.image(href=patternImages[g["key"]], insert=(0, 0), size=imageSize)
+
+    # position cells
+    cells = []
+    for d in data:
+        # Mercator proj
+        # (x, y) = gu.coordinateToPixel((d["lon"], d["lat"]), width, height, bounds)
+
+        # No proj
+        # x = d["col"] * cellW + offsetX
+        # y = d["row"] * cellH + offsetY
+
+        # LCC proj
+        x = d["xn"] * innerWidth + offsetX
+        y = d["yn"] * innerHeight + offsetY
+        cells.append((d, x+halfW, y+halfH))
+
+    # add cells
+    with svg.group(id="cells"):
+        for d, cx, cy in cells:
+            color = "none"
+            if SHOW_COLOR:
+                # color = d["group"]["color"]
+                color = "url(#pattern%s)" % d["group"]["key"]
+            # svg.rect(insert=(x, y), size=(cellW, cellH), fill=color, stroke="#000000", stroke_width=1)
+            svg.ellipse(center=(cx, cy), r=(halfW, halfH), fill=color, stroke="#000000", stroke_width=1)
+
+    # add labels, one group per data group
+    with svg.group(id="labels"):
+        for g in GROUPS:
+            with svg.group(id="labels%s" % g["key"]):
+                for d, cx, cy in cells:
+                    if d["group"]["key"] == g["key"]:
+                        svg.text(d["group"]["key"], insert=(cx, cy), text_anchor="middle", alignment_baseline="middle", font_size=11)
+
+    svg.rect(insert=(PAD,PAD), size=(WIDTH, HEIGHT), stroke_width=1, stroke="#000000", fill="none")
+    svg.save()
+    print "Saved svg: %s" % filename
+    return filename
+
+def makeMapJob(job):
+    return makeMap(*job)
+
+def build(config=None):
+    args = parser.parse_args([])
+    args.__dict__.update(config or {})
+    regions = [(args.GEO_FILE, args.PROJECTION)]
+    if len(args.REGIONS):
+        regions = [tuple(r.split(":")) for r in args.REGIONS.split(",")]
+
+    # read before forking so workers share the data
+    readData(args.INPUT_FILE, args.VARIABLE, args.TIME_INDEX)
+    if args.PROCESSES > 1 and len(regions) > 1:
+        pool = multiprocessing.Pool(min(args.PROCESSES, len(regions)))
+        filenames = pool.map(makeMapJob, [(region, args) for region in regions])
+        pool.close()
+        pool.join()
+    else:
+        filenames = [makeMap(region, args) for region in regions]
+    print "Saved %s region(s)" % len(filenames)
+    return filenames
 
 # get clusters
 # y = np.array(values)
@@ -251,3 +258,6 @@ print "Saved svg: %s" % filename
 # print "Clusters:"
 # for k,v in C.items():
 #     print "Cluster: %s, Size: %s" % (clusters[k], v)
+
+if __name__ == "__main__":
+    build(vars(parser.parse_args()))
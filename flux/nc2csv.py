@@ -1,24 +1,43 @@
 # -*- coding: utf-8 -*-
 
+# Usage:
+#   python nc2csv.py
+#   python nc2csv.py -in data/CT2015.flux1x1.longterm.nc,data/CT2015.flux1x1.2014-mean.nc,data/CT2016.flux1x1.longterm.nc
+#   python nc2csv.py -vars fossil_flux_imp,bio_flux_opt -time 0
+
+import argparse
 import csv
 import math
 from netCDF4 import Dataset
-from PIL import Image
+import numpy as np
+import os
 import sys
 
+# add parent directory to sys path to import relative modules when run as a script
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lib.imageutils as iu
+
 # source: ftp://aftp.cmdl.noaa.gov/products/carbontracker/co2/fluxes/monthly/
 # info: https://www.esrl.noaa.gov/gmd/ccgg/carbontracker/fluxmaps.php?type=us
 # version: CT2015 1x1 3-hourly fluxes as of 2016-02-20 06:38:03 UTC
 # averaging_period: 2001-2014 mean
 # conversions: http://cdiac.ornl.gov/pns/convert.html
 
-INPUT_FILE = 'data/CT2015.flux1x1.longterm.nc'
-LAND_WATER_FILE = 'data/land_water.dat'
-OUTPUT_FILE = 'data/CT2015_flux1x1_longterm.csv'
-IMAGE_FILE = 'data/CT2015_flux1x1_longterm.png'
-# INPUT_FILE = 'data/CT2015.flux1x1.2014-mean.nc'
-# OUTPUT_FILE = 'data/CT2015_flux1x1_2014-mean.csv'
-# IMAGE_FILE = 'data/CT2015_flux1x1_2014-mean.png'
+# input
+parser = argparse.ArgumentParser()
+parser.add_argument('-in', dest="INPUT_FILES", default="data/CT2015.flux1x1.longterm.nc", help="Comma-separated list of NetCDF input files")
+parser.add_argument('-vars', dest="VARIABLES", default="fossil_flux_imp", help="Comma-separated list of flux variables; the first one is written to csv")
+parser.add_argument('-time', dest="TIME_INDEX", type=int, default=0, help="Time step written to csv and png")
+parser.add_argument('-land', dest="LAND_WATER_FILE", default="data/land_water.dat", help="Land/water mask file")
+parser.add_argument('-out', dest="OUTPUT_FILE", default="data/%s", help="Output file pattern without extension; .csv, .npz and .png are written")
+
+# mols per square meter per second to metric tons per square kilometer per year:
+# seconds to years, mols to grams, square meters to square kilometers, grams to metric tons
+SECONDS_PER_YEAR = 3600 * 24 * 365.25
+CO2_MOLAR_MASS = 44.009
+TONS_KM_2_Y_1 = SECONDS_PER_YEAR * CO2_MOLAR_MASS * 1000000 / 1000000
 
 def ncdump(nc_fid, verb=True):
     def print_ncattr(key):
@@ -55,17 +74,6 @@ def ncdump(nc_fid, verb=True):
                 print_ncattr(var)
     return nc_attrs, nc_dims, nc_vars
 
-ds = Dataset(INPUT_FILE, 'r')
-# print ds
-# nc_attrs, nc_dims, nc_vars = ncdump(ds)
-
-# Extract data from NetCDF file
-lats = ds.variables['lat'][:]
-lons = ds.variables['lon'][:]
-fffs = ds.variables['fossil_flux_imp'][:][0]
-w = len(lons)
-h = len(lats)
-
 # Source: http://www.pmel.noaa.gov/maillists/tmap/ferret_users/fu_2004/msg00023.html
 def latLonArea(lat1, lon1, lat2, lon2):
     R = 6371 # radius of Earth in km
@@ -76,62 +84,67 @@ def latLonArea(lat1, lon1, lat2, lon2):
     A = math.pow(R, 2) * abs(math.sin(lat1)-math.sin(lat2)) * abs(lon1-lon2)
     return A
 
-# land/water data
-land = [int(line) for line in open(LAND_WATER_FILE)]
-
-rows = []
-maxValue = 0
-for y, lat in enumerate(lats):
-    for x, lon in enumerate(lons):
-        # print "%s, %s, %s" % (lat, lon, fffs[y][x])
-        # CO2 exchange in mols per square meter per second
-        mol_m_2_s_1 = fffs[y][x]
-        # seconds to years
-        mol_m_2_y_1 = mol_m_2_s_1 * 3600 * 24 * 365.25
-        # mols to grams
-        g_m_2_y_1 = mol_m_2_y_1 * 44.009
-        # CO2 exchange in grams per square kilometer per year
-        g_km_2_y_1 = g_m_2_y_1 * 1000000
-        # CO2 exchange in metric tons per square kilometer per year
-        ton_km_2_y_1 = g_km_2_y_1 / 1000000
-        # # area of lat/lon in km^2
-        # lat_lon_km2 = latLonArea(math.floor(lat), math.floor(lon), math.ceil(lat), math.ceil(lon))
-        # # square kilometer to 1x1-degree
-        # g_degree_2_y_1 = g_km_2_y_1 * lat_lon_km2
-        # # CO2 exchange in metric tons per 1x1-degree per year
-        # ton_degree_2_y_1 = g_degree_2_y_1 / 1000000
-        value = ton_km_2_y_1
-        if land[(h-y-1) * w + x] <= 0:
-            value = -1
-        rows.append([lat, lon, value])
-        if ton_km_2_y_1 > maxValue:
-            maxValue = ton_km_2_y_1
-
-print "Max value: %s" % maxValue
-print "Printing %s rows to file" % len(rows)
-
-# show image
-im = Image.new("RGB", (360, 180))
-pixeldata = [(0,0,0) for n in range(len(rows))]
-for y, lat in enumerate(lats):
-    for x, lon in enumerate(lons):
-        r = y * w + x
-        v = rows[r][2]
-        red = int(v / maxValue * 255)
-        color = (red, 0, 0)
-        if v < 0:
-            color = (0,0,20)
-        pixeldata[(h-1-y) * w + x] = color
-im.putdata(pixeldata)
-im.show()
-im.save(IMAGE_FILE)
-
-header = ["lat", "lon", "ff_flux"]
-
-with open(OUTPUT_FILE, 'wb') as f:
-    cw = csv.writer(f, delimiter=',')
-    cw.writerow(header)
-    for row in rows:
-        cw.writerow(row)
-
-print "Wrote %s rows to file %s" % (len(rows), OUTPUT_FILE)
+def readLand(filename, w, h):
+    # land/water data is stored from north to south; flip so rows follow latitude order
+    land = np.loadtxt(filename, dtype=np.int32)
+    return (land.reshape(h, w)[::-1] > 0)
+
+def build(config=None):
+    args = parser.parse_args([])
+    args.__dict__.update(config or {})
+    INPUT_FILES = args.INPUT_FILES.split(",")
+    VARIABLES = args.VARIABLES.split(",")
+    TIME_INDEX = args.TIME_INDEX
+
+    lands = {}
+    outputs = []
+    for filename in INPUT_FILES:
+        ds = Dataset(filename, 'r')
+        # print ds
+        # nc_attrs, nc_dims, nc_vars = ncdump(ds)
+
+        # Extract data from NetCDF file
+        lats = np.asarray(ds.variables['lat'][:], dtype=np.float64)
+        lons = np.asarray(ds.variables['lon'][:], dtype=np.float64)
+        w = len(lons)
+        h = len(lats)
+        if (w, h) not in lands:
+            lands[(w, h)] = readLand(args.LAND_WATER_FILE, w, h)
+        land = lands[(w, h)]
+
+        basename = os.path.basename(filename)[:-len(".nc")].replace(".", "_")
+        outfile = args.OUTPUT_FILE % basename
+
+        grids = {}
+        for variable in VARIABLES:
+            # CO2 exchange in mols per square meter per second, shape: time x lat x lon
+            flux = np.ma.filled(ds.variables[variable][:], 0).astype(np.float64)
+            tons = flux * TONS_KM_2_Y_1
+            grids[variable] = np.where(land, tons, -1)
+            grids[variable + "_max"] = tons.reshape(len(tons), -1).max(axis=1)
+        ds.close()
+
+        np.savez(outfile + ".npz", lats=lats, lons=lons, land=land, **grids)
+        print "Wrote %s variable(s) to %s.npz" % (len(VARIABLES), outfile)
+
+        variable = VARIABLES[0]
+        values = grids[variable][TIME_INDEX]
+        maxValue = grids[variable + "_max"][TIME_INDEX]
+        print "Max value: %s" % maxValue
+
+        # save image
+        iu.saveGridImage(outfile + ".png", values, ramp="red", maxValue=maxValue, mask=land, maskColor=(0,0,20), flipY=True)
+
+        # write csv with one row per cell, latitude-major
+        lonGrid, latGrid = np.meshgrid(lons, lats)
+        header = ["lat", "lon", "ff_flux"]
+        with open(outfile + ".csv", 'wb') as f:
+            cw = csv.writer(f, delimiter=',')
+            cw.writerow(header)
+            cw.writerows(zip(latGrid.ravel().tolist(), lonGrid.ravel().tolist(), values.ravel().tolist()))
+        print "Wrote %s rows to file %s.csv" % (values.size, outfile)
+        outputs += [outfile + ".csv", outfile + ".npz", outfile + ".png"]
+    return outputs
+
+if __name__ == "__main__":
+    build(vars(parser.parse_args()))
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+import os
+import tempfile
+
+# Base for the caches in lib that keep recently used entries in memory and,
+# given a directory, one file per entry on disk. Files are written under a
+# temporary name and renamed into place, so an interrupted build or another
+# process reading the same directory never sees a partial entry, and a file
+# that can't be read back is a miss. Subclasses set the file extension and
+# how entries are read and written.
+class DiskCache(object):
+
+    extension = "cache"
+    # errors reading a stored entry that make it a miss
+    readErrors = (IOError, OSError, ValueError)
+
+    def __init__(self, directory=None, maxEntries=64, maxBytes=None):
+        # absolute, since build workers change directory between pages
+        self.directory = os.path.abspath(directory) if directory else None
+        self.maxEntries = maxEntries
+        # with maxBytes, least recently used files are removed to keep the directory under it
+        self.maxBytes = maxBytes
+        self.entries = OrderedDict()
+        # bytes on disk, counted on the first write and rescanned when over maxBytes
+        self.size = None
+
+    def diskFiles(self):
+        # other processes may remove files while we look, so skip any that are gone
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith("." + self.extension):
+                filename = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(filename)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, filename))
+        return files
+
+    def evict(self):
+        # remove least recently used files until the cache fits in maxBytes
+        files = self.diskFiles()
+        total = sum([f[1] for f in files])
+        for mtime, size, filename in sorted(files):
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+            total -= size
+        self.size = total
+
+    def filename(self, key):
+        return os.path.join(self.directory, "%s.%s" % (key, self.extension))
+
+    def get(self, key):
+        if key in self.entries:
+            value = self.entries.pop(key)
+            self.entries[key] = value
+            return value
+        value = self.loadStored(key)
+        if value is not None:
+            self.remember(key, value)
+        return value
+
+    def loadStored(self, key):
+        if not self.directory:
+            return None
+        filename = self.filename(key)
+        if not os.path.isfile(filename):
+            return None
+        try:
+            value = self.read(filename)
+            if self.maxBytes:
+                # touch so eviction treats this entry as recently used
+                os.utime(filename, None)
+        except self.readErrors:
+            return None
+        return value
+
+    def put(self, key, value, persist=True):
+        self.remember(key, value)
+        if self.directory and persist:
+            self.store(key, value)
+
+    def read(self, filename):
+        with open(filename, "rb") as f:
+            return f.read()
+
+    def remember(self, key, value):
+        self.entries[key] = value
+        while len(self.entries) > self.maxEntries:
+            self.entries.popitem(last=False)
+
+    def store(self, key, value):
+        # created on first write, and again if something removed it since
+        if not os.path.isdir(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError:
+                if not os.path.isdir(self.directory):
+                    raise
+        (fd, tmp) = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                self.write(f, value)
+            size = os.path.getsize(tmp)
+            os.rename(tmp, self.filename(key))
+        except:
+            os.remove(tmp)
+            raise
+        if self.maxBytes:
+            if self.size is None:
+                self.size = sum([f[1] for f in self.diskFiles()])
+            else:
+                self.size += size
+            if self.size > self.maxBytes:
+                self.evict()
+
+    def write(self, f, value):
+        f.write(value)
+
+# one cache per class, directory and arguments per process
+CACHES = {}
+
+def getCache(cls, directory=None, *args):
+    if directory:
+        directory = os.path.abspath(directory)
+    key = (cls, directory) + args
+    if key not in CACHES:
+        CACHES[key] = cls(directory, *args)
+    return CACHES[key]
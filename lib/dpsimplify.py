@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+# Douglas-Peucker line simplification with the same interface as polysimplify.VWSimplifier
+#
+# Each vertex gets a threshold: the distance at which Douglas-Peucker would
+# split on it, capped by its parent's threshold. Keeping vertices with a
+# threshold above a tolerance gives exactly the classic DP result, and keeping
+# the n highest gives a DP hierarchy for a target number of points. Capping
+# makes ties common, so vertices also remember the order they were split in
+# and ties go to the earlier split.
+
+import numpy as np
+
+class DPSimplifier(object):
+
+    # with a tolerance, segments within it are not split further; only from_threshold(t >= tolerance) is then exact
+    def __init__(self, pts, thresholds=None, tolerance=None, order=None):
+        self.pts = np.array(pts, dtype=np.float64)
+        self.order = order
+        if thresholds is None:
+            thresholds = self.build_thresholds(tolerance)
+        self.thresholds = np.asarray(thresholds)
+        if self.order is None:
+            # without a split order ties go to the first vertex
+            self.order = np.arange(len(self.thresholds))
+
+    def build_thresholds(self, tolerance=None):
+        pts = self.pts
+        n = len(pts)
+        thresholds = np.zeros(n, dtype=np.float64)
+        # vertices that are never split rank after every split
+        self.order = np.full(n, n, dtype=np.int64)
+        if n < 1:
+            return thresholds
+        self.order[0] = 0
+        self.order[-1] = 0
+        splits = 0
+        thresholds[0] = np.inf
+        thresholds[-1] = np.inf
+        # explicit stack of (start, end, parent threshold) instead of recursion
+        stack = [(0, n-1, np.inf)]
+        while stack:
+            (start, end, parent) = stack.pop()
+            if end - start < 2:
+                continue
+            a = pts[start]
+            b = pts[end]
+            between = pts[start+1:end]
+            ab = b - a
+            length = np.hypot(ab[0], ab[1])
+            if length > 0:
+                # perpendicular distance to the line through a and b
+                distances = np.abs(ab[0] * (between[:,1] - a[1]) - ab[1] * (between[:,0] - a[0])) / length
+            else:
+                # closed ring: distance to the shared end point
+                distances = np.hypot(between[:,0] - a[0], between[:,1] - a[1])
+            i = int(np.argmax(distances))
+            index = start + 1 + i
+            threshold = min(distances[i], parent)
+            if tolerance is not None and threshold <= tolerance:
+                continue
+            thresholds[index] = threshold
+            splits += 1
+            self.order[index] = splits
+            stack.append((start, index, threshold))
+            stack.append((index, end, threshold))
+        return thresholds
+
+    def from_threshold(self, tolerance):
+        return self.pts[self.thresholds > tolerance]
+
+    def from_number(self, n):
+        n = int(n)
+        size = len(self.thresholds)
+        if n >= size:
+            return self.pts
+        # highest threshold last, earlier splits last among ties
+        ranked = np.lexsort((-self.order, self.thresholds))
+        keep = np.sort(ranked[size - max(n, 0):])
+        return self.pts[keep]
+
+    def from_ratio(self, r):
+        if r <= 0 or r > 1:
+            raise ValueError("Ratio must be 0<r<=1")
+        return self.from_number(r * len(self.thresholds))
+
+def benchmark(filenames, ratio=0.1, tolerance=1.0):
+    # compare against Visvalingam-Whyatt on contours traced the same way as slr_manhattan/slr.py
+    from time import time
+    from PIL import Image
+    from skimage import measure
+    from polysimplify import VWSimplifier
+    for filename in filenames:
+        im = Image.open(filename).convert("RGBA")
+        alpha = (np.array(im)[:,:,3] > 0).astype(np.float64)
+        contours = [c[:,::-1] for c in measure.find_contours(alpha, 0.2) if len(c) > 2]
+        vertices = sum([len(c) for c in contours])
+        print "%s: %s contours, %s vertices, keeping %s%%" % (filename, len(contours), vertices, int(ratio*100))
+        for name, engine in [("vw", VWSimplifier), ("dp", DPSimplifier)]:
+            start = time()
+            kept = 0
+            for c in contours:
+                kept += len(engine(c).from_number(ratio * len(c)))
+            print "  %s: %.4fs, %s vertices kept" % (name, time() - start, kept)
+        start = time()
+        kept = 0
+        for c in contours:
+            kept += len(DPSimplifier(c, tolerance=tolerance).from_threshold(tolerance))
+        print "  dp with tolerance %spx: %.4fs, %s vertices kept" % (tolerance, time() - start, kept)
+
+if __name__ == "__main__":
+    # e.g. python dpsimplify.py ../slr_manhattan/data/slr_2d.png ../slr_manhattan/data/slr_4d.png
+    import sys
+    benchmark(sys.argv[1:])
@@ -6,6 +6,9 @@ import numpy as np
 import shapefile # https://github.com/GeospatialPython/pyshp
 import sys
 
+from polysimplify import VWSimplifier
+import projection as proj
+
 def mercator(radians):
     return math.log(math.tan(radians*0.5 + math.pi*0.25))
 
@@ -28,21 +31,8 @@ class GeoJSONUtil:
     # http://stackoverflow.com/questions/2651099/convert-long-lat-to-pixel-x-y-on-a-given-picture
     # http://gis.stackexchange.com/questions/71643/map-projection-lat-lon-to-pixel
     def coordinateToPixel(self, lnglat, w, h, bounds):
-        west = math.radians(bounds[0])
-        south = math.radians(bounds[1])
-        east = math.radians(bounds[2])
-        north = math.radians(bounds[3])
-
-        ymin = mercator(south)
-        ymax = mercator(north)
-        xFactor = 1.0 * w / (east - west)
-        yFactor = 1.0 * h / (ymax - ymin)
-
-        x = math.radians(lnglat[0])
-        y = mercator(math.radians(lnglat[1]))
-        x = (x - west) * xFactor
-        y = (ymax - y) * yFactor # y points south
-        return (x, y)
+        (x, y) = proj.mercatorToPixels([lnglat[0]], [lnglat[1]], w, h, bounds)
+        return (float(x[0]), float(y[0]))
 
     def filterFeatures(self, key, value):
         self.features = [f for f in self.features if key in f["properties"] and f["properties"][key] == value]
@@ -99,6 +89,74 @@ class GeoJSONUtil:
             shapes.append(featureShapes)
         self.shapes = shapes
 
+    # Split rings into arcs shared between neighboring shapes (like TopoJSON)
+    # self.arcs: list of lnglat lists; self.topoShapes: self.shapes with each ring as a list of arc refs (~i is arc i reversed)
+    def getTopology(self):
+        rings = []
+        for featureShapes in self.shapes:
+            featureRings = []
+            for featureShape in featureShapes:
+                ring = [tuple(p[:2]) for p in featureShape]
+                # drop the closing point; rings are reassembled closed
+                if len(ring) > 1 and ring[0] == ring[-1]:
+                    ring = ring[:-1]
+                featureRings.append(ring)
+            rings.append(featureRings)
+
+        # a point is a junction if it appears with different neighbors in different places
+        neighbors = {}
+        junctions = set()
+        for featureRings in rings:
+            for ring in featureRings:
+                n = len(ring)
+                for i, p in enumerate(ring):
+                    pair = frozenset([ring[i-1], ring[(i+1) % n]])
+                    if p not in neighbors:
+                        neighbors[p] = pair
+                    elif neighbors[p] != pair:
+                        junctions.add(p)
+
+        arcs = []
+        arcIndex = {}
+        def addArc(arc):
+            key = tuple(arc)
+            if key in arcIndex:
+                return arcIndex[key]
+            reverseKey = tuple(reversed(arc))
+            if reverseKey in arcIndex:
+                return ~arcIndex[reverseKey]
+            arcIndex[key] = len(arcs)
+            arcs.append(arc)
+            return arcIndex[key]
+
+        topoShapes = []
+        for featureRings in rings:
+            featureTopo = []
+            for ring in featureRings:
+                starts = [i for i, p in enumerate(ring) if p in junctions]
+                if len(ring) < 3 or not len(starts):
+                    # no shared border; rotate to a canonical start so identical rings still match
+                    start = ring.index(min(ring)) if len(ring) else 0
+                    ring = ring[start:] + ring[:start]
+                    featureTopo.append([addArc(ring + ring[:1])])
+                    continue
+                # rotate to start at a junction, then cut at every junction
+                ring = ring[starts[0]:] + ring[:starts[0]]
+                ring.append(ring[0])
+                refs = []
+                arc = [ring[0]]
+                for p in ring[1:]:
+                    arc.append(p)
+                    if p in junctions:
+                        refs.append(addArc(arc))
+                        arc = [p]
+                featureTopo.append(refs)
+            topoShapes.append(featureTopo)
+
+        self.arcs = arcs
+        self.topoShapes = topoShapes
+        return (arcs, topoShapes)
+
     def onlyBiggestShape(self):
         shapes = sorted(self.shapes, key=lambda s: -1 * self.polygonArea(s[0]))
         if len(shapes):
@@ -143,12 +201,37 @@ class GeoJSONUtil:
         for featureShapes in self.shapes:
             featurePolygons = []
             for featureShape in featureShapes:
+                lnglats = np.array(featureShape, dtype=np.float64)
+                (xs, ys) = proj.mercatorToPixels(lnglats[:,0], lnglats[:,1], targetWidth, targetHeight, bounds)
+                featurePolygon = zip((xs + offsetX).tolist(), (ys + offsetY).tolist())
+                featurePolygons.append(featurePolygon)
+            polygons.append(featurePolygons)
+        return polygons
+
+    # Same as toPolygons, but shared borders are projected and simplified once and stay watertight
+    # simplifyRatio keeps that fraction of each arc's vertices (arc end points are always kept)
+    def toTopoPolygons(self, targetWidth, offsetX=0, offsetY=0, simplifyRatio=None):
+        (arcs, topoShapes) = self.getTopology()
+        bounds = self.getBounds()
+        (w, h) = self.getDimensions()
+        targetHeight = 1.0 * targetWidth * (1.0 * h / w)
+        projected = []
+        for arc in arcs:
+            lnglats = np.array(arc, dtype=np.float64)
+            (xs, ys) = proj.mercatorToPixels(lnglats[:,0], lnglats[:,1], targetWidth, targetHeight, bounds)
+            points = np.column_stack((xs + offsetX, ys + offsetY))
+            if simplifyRatio is not None and len(points) > 2:
+                points = VWSimplifier(points).from_number(max(2, int(simplifyRatio * len(points))))
+            projected.append(map(tuple, points.tolist()))
+        polygons = []
+        for featureTopo in topoShapes:
+            featurePolygons = []
+            for refs in featureTopo:
                 featurePolygon = []
-                for lnglat in featureShape:
-                    (x, y) = self.coordinateToPixel(lnglat, targetWidth, targetHeight, bounds)
-                    # x = 1.0 * (lnglat[0] - bounds[0]) / (bounds[2] - bounds[0]) * targetWidth + offsetX
-                    # y = (1.0 - (lnglat[1] - bounds[1]) / (bounds[3] - bounds[1])) * targetHeight + offsetY
-                    featurePolygon.append((x + offsetX, y + offsetY))
+                for ref in refs:
+                    points = projected[ref] if ref >= 0 else projected[~ref][::-1]
+                    # consecutive arcs share their end points
+                    featurePolygon.extend(points if not len(featurePolygon) else points[1:])
                 featurePolygons.append(featurePolygon)
             polygons.append(featurePolygons)
         return polygons
@@ -1,29 +1,51 @@
 # -*- coding: utf-8 -*-
 
+import csv
+import json
 import math
 import matplotlib.path as mplPath
 import numpy as np
+import os
+import tempfile
+
+import projection as proj
+
+# in-process cache of rasterized region masks, keyed by (geo file, mtime, lats, lons)
+REGION_MASKS = {}
 
 def containsPoint(points, point):
     bbPath = mplPath.Path(np.array(points))
     return bbPath.contains_point(point)
 
 def coordinateToPixel(lnglat, w, h, bounds):
-    west = math.radians(bounds[0])
-    south = math.radians(bounds[1])
-    east = math.radians(bounds[2])
-    north = math.radians(bounds[3])
+    (x, y) = proj.mercatorToPixels([lnglat[0]], [lnglat[1]], w, h, bounds)
+    return (float(x[0]), float(y[0]))
 
-    ymin = mercator(south)
-    ymax = mercator(north)
-    xFactor = 1.0 * w / (east - west)
-    yFactor = 1.0 * h / (ymax - ymin)
+def coordinatesToPixels(lnglats, w, h, bounds):
+    lnglats = np.asarray(lnglats, dtype=np.float64)
+    return proj.mercatorToPixels(lnglats[:,0], lnglats[:,1], w, h, bounds)
 
-    x = math.radians(lnglat[0])
-    y = mercator(math.radians(lnglat[1]))
-    x = (x - west) * xFactor
-    y = (ymax - y) * yFactor # y points south
-    return (x, y)
+def getGeoCoordinates(filename, biggestOnly=True):
+    # retrieve the outer ring of each feature, biggest polygon first
+    geodata = {}
+    with open(filename) as f:
+        geodata = json.load(f)
+    coordinates = []
+    for feature in geodata["features"]:
+        t = feature["geometry"]["type"]
+        gcoordinates = feature["geometry"]["coordinates"]
+        if t == "MultiPolygon":
+            gcoordinates = sorted(gcoordinates, key=lambda c: -1*len(c[0]))
+        else:
+            gcoordinates = sorted(gcoordinates, key=lambda c: -1*len(c))
+        for coordinate in gcoordinates:
+            if t == "MultiPolygon":
+                coordinates.append(coordinate[0])
+            else:
+                coordinates.append(coordinate)
+            if biggestOnly:
+                break
+    return coordinates
 
 def getBounds(coordinates):
     lngs = [c[0] for c in coordinates]
@@ -46,9 +68,80 @@ def getRatio(coordinates):
     height = (ymax - ymin)
     return (width, height)
 
+def gridCellCenters(lats=180, lons=360):
+    # lng/lat of cell centers, rows go from south to north
+    lngs = -180.0 + (np.arange(lons) + 0.5) * 360.0 / lons
+    lts = -90.0 + (np.arange(lats) + 0.5) * 180.0 / lats
+    return np.meshgrid(lngs, lts)
+
 def mercator(radians):
     return math.log(math.tan(radians*0.5 + math.pi*0.25))
 
+def pointsWithinCoordinates(coords, lngs, lats):
+    # vectorized withinCoordinates: bounding box prefilter, then one contains_points call per polygon
+    lngs = np.asarray(lngs, dtype=np.float64).ravel()
+    lats = np.asarray(lats, dtype=np.float64).ravel()
+    within = np.zeros(len(lngs), dtype=bool)
+    for c in coords:
+        points = np.array(c, dtype=np.float64)[:,:2]
+        (minLng, minLat) = points.min(axis=0)
+        (maxLng, maxLat) = points.max(axis=0)
+        candidates = np.flatnonzero(~within & (lngs >= minLng) & (lngs <= maxLng) & (lats >= minLat) & (lats <= maxLat))
+        if not len(candidates):
+            continue
+        bbPath = mplPath.Path(points)
+        within[candidates] = bbPath.contains_points(np.column_stack((lngs[candidates], lats[candidates])))
+    return within
+
+def readGridRows(filename, variable="fossil_flux_imp", timeIndex=0):
+    """(lat, lon, value) rows of a grid written by flux/nc2csv.py, from its .csv or, for a variable's time step, its .npz"""
+    if filename.endswith(".npz"):
+        with np.load(filename) as npz:
+            values = npz[variable][timeIndex]
+            lonGrid, latGrid = np.meshgrid(npz["lons"], npz["lats"])
+        return zip(latGrid.ravel().tolist(), lonGrid.ravel().tolist(), values.ravel().tolist())
+    with open(filename, 'rb') as f:
+        r = csv.reader(f, delimiter=',')
+        # skip header
+        next(r, None)
+        return list(r)
+
+def regionMask(filename, lats=180, lons=360, biggestOnly=True, cache=True):
+    # rasterize a geojson region onto a lat/lon grid; cached in memory and on disk next to the geo file
+    mtime = os.path.getmtime(filename)
+    key = (os.path.abspath(filename), mtime, lats, lons, biggestOnly)
+    if key in REGION_MASKS:
+        return REGION_MASKS[key]
+    cacheFile = "%s.mask%sx%s%s.npy" % (filename, lats, lons, "" if biggestOnly else "_all")
+    mask = None
+    if cache and os.path.isfile(cacheFile) and os.path.getmtime(cacheFile) >= mtime:
+        # a mask file that can't be read back is a miss
+        try:
+            mask = np.load(cacheFile)
+        except (IOError, OSError, ValueError):
+            mask = None
+        if mask is not None and mask.shape != (lats, lons):
+            mask = None
+    if mask is None:
+        coordinates = getGeoCoordinates(filename, biggestOnly)
+        (lngGrid, latGrid) = gridCellCenters(lats, lons)
+        mask = pointsWithinCoordinates(coordinates, lngGrid, latGrid).reshape(lats, lons)
+        if cache:
+            saveMask(cacheFile, mask)
+    REGION_MASKS[key] = mask
+    return mask
+
+def saveMask(filename, mask):
+    # write under a temporary name and rename into place so pages building in parallel never read a partial mask
+    (fd, tmp) = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(filename)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, mask)
+        os.rename(tmp, filename)
+    except:
+        os.remove(tmp)
+        raise
+
 def withinCoordinates(coords, p):
     within = False
     for c in coords:
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import cPickle as pickle
+import hashlib
+import os
+
+import diskcache
+from path import parse_paths
+
+# Keeps the data read from icon files, keyed by path, modification time and
+# size, so a build reads and parses each icon once however many pages use it.
+class IconCache(diskcache.DiskCache):
+
+    extension = "pickle"
+    readErrors = diskcache.DiskCache.readErrors + (EOFError, pickle.UnpicklingError)
+
+    def __init__(self, directory=None, reader=None, maxEntries=256):
+        diskcache.DiskCache.__init__(self, directory, maxEntries)
+        self.reader = reader
+
+    def filename(self, key):
+        return os.path.join(self.directory, "%s.%s" % (hashlib.sha1(key).hexdigest(), self.extension))
+
+    def get(self, filename):
+        key = self.key(filename)
+        entry = diskcache.DiskCache.get(self, key)
+        if entry is None:
+            entry = self.load(filename)
+            self.put(key, entry)
+        return entry
+
+    def key(self, filename):
+        stat = os.stat(filename)
+        return "%s:%s:%s" % (os.path.abspath(filename), stat.st_mtime, stat.st_size)
+
+    def load(self, filename):
+        entry = self.reader(filename)
+        try:
+            entry["pathArrays"] = parse_paths(entry["paths"])
+        except ValueError as e:
+            # keep the raw data usable; getParsedDataFromSVG raises for this file
+            print "Warning: couldn't parse paths in %s: %s" % (filename, e)
+            entry["pathArrays"] = None
+            entry["pathError"] = str(e)
+        return entry
+
+    def read(self, filename):
+        with open(filename, 'rb') as f:
+            return pickle.load(f)
+
+    def write(self, f, entry):
+        pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+
+# one cache per reader and directory per process
+def getCache(reader, directory=None):
+    return diskcache.getCache(IconCache, directory, reader)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from PIL import Image
+
+# Color ramps as lists of evenly spaced RGB stops from low to high values
+RAMPS = {
+    "red": [(0,0,0), (255,0,0)],
+    "gray": [(0,0,0), (255,255,255)],
+    "heat": [(0,0,0), (128,0,0), (255,128,0), (255,255,160)],
+    "green": [(0,0,0), (73,181,72)]
+}
+
+def applyRamp(n, ramp="red"):
+    """Map an array of normalized values (0-1) to an (..., 3) uint8 array of colors"""
+    stops = np.array(RAMPS[ramp] if isinstance(ramp, basestring) else ramp, dtype=np.float64)
+    positions = np.linspace(0, 1, len(stops))
+    flat = n.reshape(-1)
+    rgb = np.empty((len(flat), 3), dtype=np.float64)
+    for channel in range(3):
+        rgb[:,channel] = np.interp(flat, positions, stops[:,channel])
+    return np.rint(rgb).astype(np.uint8).reshape(n.shape + (3,))
+
+def gridToArray(grid, ramp="red", minValue=0, maxValue=None, mask=None, maskColor=(0,0,0), levels=256, visibleMin=False, flipY=False):
+    """Normalize a 2-D grid of values and color it; cells where mask is False get maskColor.
+    Values are quantized to a number of levels; with visibleMin, any value above minValue gets at least the first level"""
+    grid = np.asarray(grid, dtype=np.float64)
+    if maxValue is None:
+        maxValue = grid.max() if mask is None else grid[mask].max()
+    span = maxValue - minValue
+    if span <= 0:
+        span = 1.0
+    n = np.clip((grid - minValue) / span, 0, 1)
+    level = np.floor(n * (levels-1))
+    if visibleMin:
+        level[(grid > minValue) & (level < 1)] = 1
+    rgb = applyRamp(level / (levels-1), ramp)
+    if mask is not None:
+        rgb[~np.asarray(mask, dtype=bool)] = maskColor
+    if flipY:
+        rgb = rgb[::-1]
+    return np.ascontiguousarray(rgb)
+
+def gridToImage(grid, **kwargs):
+    return Image.fromarray(gridToArray(grid, **kwargs), "RGB")
+
+def saveGridImage(filename, grid, **kwargs):
+    """Render a value grid and write it to disk without opening a viewer"""
+    im = gridToImage(grid, **kwargs)
+    im.save(filename)
+    print "Saved image: %s" % filename
+    return im
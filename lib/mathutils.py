@@ -3,7 +3,9 @@
 import math
 import matplotlib.path as mplPath
 import numpy as np
+from dpsimplify import DPSimplifier
 from polysimplify import VWSimplifier
+import simplifycache
 from scipy.ndimage import gaussian_filter1d
 
 def angleBetweenPoints(p1, p2):
@@ -121,10 +123,20 @@ def scalePoints(points, scale):
         points[i] = (p[0]*scale, p[1]*scale)
     return points
 
-# for line simplification
-def simplify(line, targetLength=100):
-    simplifier = VWSimplifier(line)
-    simplified = simplifier.from_number(targetLength)
+# for line simplification; engine is "vw" (Visvalingam-Whyatt) or "dp" (Douglas-Peucker)
+# tolerance keeps points by significance (area for vw, distance for dp) instead of by count
+# pass a cache directory to reuse vw thresholds across runs
+def simplify(line, targetLength=100, cacheDir=None, engine="vw", tolerance=None):
+    if engine == "dp":
+        simplifier = DPSimplifier(line, tolerance=tolerance)
+    elif cacheDir:
+        simplifier = simplifycache.getCache(cacheDir).simplifier(line)
+    else:
+        simplifier = VWSimplifier(line)
+    if tolerance is not None:
+        simplified = simplifier.from_threshold(tolerance)
+    else:
+        simplified = simplifier.from_number(targetLength)
     return simplified.tolist()
 
 def smoothPoints(points, resolution=3, sigma=1.8):
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import hashlib
+import io
+import json
+import math
+import numpy as np
+import os
+import zlib
+
+import diskcache
+
+# Generates the crayon texture tiles of palette/*.png from palette/colors.json
+# instead of shipping them as pre-rendered images. A tile is asked for by
+# color, size in points and dpi and is deterministic for those: its texture
+# is a fixed random spectrum per color, cut to the frequencies the requested
+# resolution can hold, so a print resolution tile is the same texture as a
+# screen one, just sampled finer. The spectrum is periodic, so tiles repeat
+# without seams. Generated tiles are cached by a hash of everything that
+# goes into them.
+
+PALETTE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "palette", "colors.json")
+# bump when the output of generateTile changes so cached tiles are not reused
+VERSION = 1
+DPI = 72
+# the texture is defined by spectrum coefficients on a grid of this many cycles per tile
+SPECTRUM_SIZE = 300
+PAPER = (244, 238, 232)
+
+PALETTES = {}
+
+def readPalette(filename=PALETTE_FILE):
+    if filename not in PALETTES:
+        with open(filename) as f:
+            PALETTES[filename] = json.load(f)
+    return PALETTES[filename]
+
+def getColor(color, palette=None):
+    """Hex value of a palette color name; hex values are passed through"""
+    if color.startswith("#"):
+        return color
+    if palette is None:
+        palette = readPalette()
+    if color not in palette:
+        raise ValueError("Unknown palette color: %s" % color)
+    return palette[color]
+
+def hexToRgb(hex):
+    hex = hex.lstrip("#")
+    return tuple([int(hex[i:i+2], 16) for i in (0, 2, 4)])
+
+def pigment(hex):
+    # crayon pigment is muted compared to the nominal palette color
+    rgb = np.array(hexToRgb(hex), dtype=np.float64)
+    return np.clip(rgb * 0.6 + np.mean(rgb) * 0.25 + 20, 0, 255)
+
+def colorSeed(hex):
+    return zlib.crc32(hex.lower()) & 0xffffffff
+
+def spectrum(seed):
+    # random coefficients with a falloff that gives waxy grain, stretched along a diagonal like crayon strokes
+    rs = np.random.RandomState(seed)
+    n = SPECTRUM_SIZE
+    k = np.fft.fftfreq(n) * n
+    fx = k[np.newaxis, :]
+    fy = k[:, np.newaxis]
+    u = (fx + fy) / math.sqrt(2)
+    v = (fx - fy) / math.sqrt(2)
+    f = np.hypot(u * 0.5, v)
+    amplitude = 1.0 / (1.0 + (f / 12.0) ** 2) * np.exp(-(f / 90.0) ** 2)
+    amplitude[0, 0] = 0
+    noise = rs.normal(size=(n, n)) + 1j * rs.normal(size=(n, n))
+    return noise * amplitude
+
+def grain(pixels, seed):
+    """Unit variance texture of pixels x pixels for a seed"""
+    coefficients = spectrum(seed)
+    n = SPECTRUM_SIZE
+    # scale by the spread at the spectrum's own resolution so every resolution shades alike
+    sigma = np.real(np.fft.ifft2(coefficients)).std()
+    k = np.rint(np.fft.fftfreq(pixels) * pixels).astype(int)
+    keep = np.abs(k) < n // 2
+    rows = k[keep] % n
+    spec = np.zeros((pixels, pixels), dtype=np.complex128)
+    spec[np.ix_(keep, keep)] = coefficients[np.ix_(rows, rows)]
+    field = np.real(np.fft.ifft2(spec)) * (1.0 * pixels * pixels / (n * n))
+    return field / sigma
+
+def generateTile(color, size=300, dpi=DPI, palette=None):
+    """A crayon texture tile of size x size points as an RGBA PIL image"""
+    from PIL import Image
+    hex = getColor(color, palette)
+    pixels = max(1, int(round(size * dpi / float(DPI))))
+    seed = colorSeed(hex)
+    t = grain(pixels, seed)
+    fleck = grain(pixels, (seed + 1) & 0xffffffff)
+    # darker on the ridges of the grain
+    shade = 1.0 - 0.1 * np.clip(t, -2.5, 2.5)
+    # paper shows through where the wax skipped over the grain
+    paper = np.clip((fleck - 1.0) / 1.2, 0, 1) * 0.5
+    rgb = pigment(hex)[np.newaxis, np.newaxis, :] * shade[:, :, np.newaxis]
+    rgb = rgb * (1 - paper[:, :, np.newaxis]) + np.array(PAPER) * paper[:, :, np.newaxis]
+    rgba = np.empty((pixels, pixels, 4), dtype=np.uint8)
+    rgba[:, :, :3] = np.clip(np.rint(rgb), 0, 255)
+    rgba[:, :, 3] = 255
+    return Image.fromarray(rgba, "RGBA")
+
+def vectorTile(color, size=300, strokes=24, palette=None):
+    """A few hundred bytes of svg: the flat color with light crayon streaks"""
+    hex = getColor(color, palette)
+    rs = np.random.RandomState(colorSeed(hex))
+    lines = []
+    for i in range(strokes):
+        x = rs.uniform(0, size)
+        y = rs.uniform(0, size)
+        length = rs.uniform(0.05, 0.2) * size
+        dx = length * 0.7
+        dy = -length * 0.7
+        # repeat strokes that leave the tile on the opposite side
+        for ox in (0, size) if x + dx > size else (0,):
+            for oy in (0, -size) if y + dy < 0 else (0,):
+                lines.append("M%d %dl%d %d" % (x - ox, y - oy, dx, dy))
+    return ('<svg xmlns="http://www.w3.org/2000/svg" width="%s" height="%s">'
+            '<rect width="%s" height="%s" fill="#%02x%02x%02x"/>'
+            '<path d="%s" stroke="#%02x%02x%02x" stroke-opacity=".4" stroke-width="2"/></svg>') % (
+            (size, size, size, size) + tuple(np.rint(pigment(hex)).astype(int)) + ("".join(lines),) + PAPER)
+
+class TileCache(diskcache.DiskCache):
+
+    extension = "png"
+
+    def key(self, hex, size, dpi):
+        pixels = max(1, int(round(size * dpi / float(DPI))))
+        return hashlib.sha1("%s:%s:%s:%s" % (VERSION, hex.lower(), SPECTRUM_SIZE, pixels)).hexdigest()
+
+    def tile(self, color, size=300, dpi=DPI, palette=None):
+        """PNG bytes of a tile, generated on first use"""
+        hex = getColor(color, palette)
+        key = self.key(hex, size, dpi)
+        value = self.get(key)
+        if value is None:
+            out = io.BytesIO()
+            generateTile(hex, size, dpi).save(out, "PNG", optimize=True)
+            value = out.getvalue()
+            self.put(key, value)
+        return value
+
+    def tileFile(self, color, size=300, dpi=DPI, palette=None):
+        """Filename of a cached tile; needs a cache directory"""
+        hex = getColor(color, palette)
+        self.tile(hex, size, dpi)
+        return self.filename(self.key(hex, size, dpi))
+
+def getCache(directory=None):
+    return diskcache.getCache(TileCache, directory)
+
+def getTileHref(color, size=300, dpi=DPI, cacheDir=None):
+    """A data URI of the tile for a color; a dpi of 0 gives the vector tile"""
+    if not dpi:
+        return "data:image/svg+xml;base64,%s" % base64.b64encode(vectorTile(color, size))
+    return "data:image/png;base64,%s" % base64.b64encode(getCache(cacheDir).tile(color, size, dpi))
+
+if __name__ == "__main__":
+    # e.g. python palette.py ../palette/generated 300 72
+    import sys
+    directory = sys.argv[1] if len(sys.argv) > 1 else "generated"
+    size = float(sys.argv[2]) if len(sys.argv) > 2 else 300
+    dpi = float(sys.argv[3]) if len(sys.argv) > 3 else DPI
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    for name in sorted(readPalette()):
+        filename = os.path.join(directory, "%s.png" % name)
+        generateTile(name, size, dpi).save(filename, "PNG", optimize=True)
+        print "Saved tile: %s" % filename
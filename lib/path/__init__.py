@@ -1,2 +1,4 @@
 from .path import Path, Line, Arc, CubicBezier, QuadraticBezier
-from .parser import parse_path
+from .parser import parse_path, parse_path_array, parse_paths
+from .patharray import PathArray
+from .writer import PathWriter
@@ -1,7 +1,9 @@
 # SVG Path specification parser
 
 import re
+import numpy as np
 from . import path
+from .patharray import PathArray, MOVE, LINE, CUBIC, QUAD, ARC, CLOSE
 
 COMMANDS = set('MmZzLlHhVvCcSsQqTtAa')
 UPPERCASE = set('MZLHVCSQTA')
@@ -9,6 +11,9 @@ UPPERCASE = set('MZLHVCSQTA')
 COMMAND_RE = re.compile("([MmZzLlHhVvCcSsQqTtAa])")
 FLOAT_RE = re.compile("[-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?")
 
+# number of values each command takes
+ARITY = {'M': 2, 'Z': 0, 'L': 2, 'H': 1, 'V': 1, 'C': 6, 'S': 4, 'Q': 4, 'T': 2, 'A': 7}
+
 
 def _tokenize_path(pathdef):
     for x in COMMAND_RE.split(pathdef):
@@ -18,11 +23,9 @@ def _tokenize_path(pathdef):
             yield token
 
 
-def parse_path(pathdef, current_pos=0j):
-    # In the SVG specs, initial movetos are absolute, even if
-    # specified as 'm'. This is the default behavior here as well.
-    # But if you pass in a current_pos variable, the initial moveto
-    # will be relative to that current_pos. This is useful.
+def parse_path_regex(pathdef, current_pos=0j):
+    # The original regular expression parser, kept to compare against
+    # in benchmark(). parse_path below gives the same segments.
     elements = list(_tokenize_path(pathdef))
     # Reverse for easy use of .pop()
     elements.reverse()
@@ -187,3 +190,294 @@ def parse_path(pathdef, current_pos=0j):
             current_pos = end
 
     return segments
+
+
+def _split_path(pathdef):
+    """Splits path data into one chunk per command, the letter followed by its
+    values. Plain string operations run in C, so this is much faster than a
+    regular expression or a loop over the characters."""
+    d = pathdef.replace(',', ' ').replace('-', ' -')
+    if 'e' in d or 'E' in d:
+        d = d.replace('e -', 'e-').replace('E -', 'E-')
+    for command in COMMANDS:
+        if command in d:
+            d = d.replace(command, ';%s ' % command)
+    return d.split(';')
+
+
+def _split_numbers(token):
+    # a token like '.5.5' or '1.5.5' holds several numbers without a separator
+    numbers = []
+    start = 0
+    dot = False
+    for i, c in enumerate(token):
+        if c == '.':
+            if dot:
+                numbers.append(token[start:i])
+                start = i
+            dot = True
+        elif c in 'eE':
+            dot = True
+    numbers.append(token[start:])
+    try:
+        return [float(number) for number in numbers]
+    except ValueError:
+        raise ValueError("Invalid number %r in path" % token)
+
+
+def _read_values(pathdef):
+    """Returns the commands as (letter, index of first value) and a flat list of values"""
+    chunks = _split_path(pathdef)
+    if chunks[0].strip():
+        raise ValueError("Unallowed implicit command in %s, position %s" % (pathdef, 0))
+    commands = []
+    count = 0
+    for chunk in chunks[1:]:
+        commands.append((chunk[0], count))
+        count += len(chunk.split()) - 1
+    # all the values are converted in one C call; numpy stops quietly at
+    # anything it can't read, which the trailing sentinel value catches
+    values = ' '.join([chunk[1:] for chunk in chunks[1:]])
+    numbers = np.fromstring(values + ' 0', dtype=np.float64, sep=' ')
+    if len(numbers) == count + 1:
+        return commands, numbers[:-1].tolist()
+    # a value numpy couldn't read, like '.5.5' for .5 and .5
+    commands = []
+    numbers = []
+    for chunk in chunks[1:]:
+        commands.append((chunk[0], len(numbers)))
+        for token in chunk[1:].split():
+            try:
+                numbers.append(float(token))
+            except ValueError:
+                numbers.extend(_split_numbers(token))
+    return commands, numbers
+
+
+def _read_path(commands, numbers, current_pos, codes, coords, n):
+    """Reads one path's commands into codes and into the preallocated coords
+    starting at n, with everything made absolute: H and V become lines, S and
+    T get their reflected control points. Returns the next free index."""
+    x = current_pos.real
+    y = current_pos.imag
+    start_x = x
+    start_y = y
+    # last control point, reflected by S and T
+    control_x = x
+    control_y = y
+    moved = False
+    last = None
+    count = len(commands)
+
+    for k in range(count):
+        letter, first = commands[k]
+        end = commands[k + 1][1] if k + 1 < count else len(numbers)
+        absolute = letter in UPPERCASE
+        command = letter.upper()
+        size = ARITY[command]
+
+        if not moved and command != 'M':
+            # drawing starts at current_pos
+            codes.append(MOVE)
+            coords[n] = x
+            coords[n + 1] = y
+            n += 2
+            moved = True
+
+        if command == 'Z':
+            if end > first:
+                raise ValueError("Unallowed implicit command after %s" % letter)
+            codes.append(CLOSE)
+            x = start_x
+            y = start_y
+            last = None
+            continue
+
+        if end == first or (end - first) % size:
+            raise ValueError("%s takes a multiple of %s values, got %s" % (letter, size, end - first))
+
+        for i in range(first, end, size):
+
+            if command == 'M':
+                px = numbers[i]
+                py = numbers[i + 1]
+                if not absolute:
+                    px += x
+                    py += y
+                codes.append(MOVE)
+                coords[n] = x = start_x = px
+                coords[n + 1] = y = start_y = py
+                n += 2
+                moved = True
+                # implicit values after a moveto are linetos
+                command = 'L'
+                last = 'M'
+                continue
+
+            elif command == 'L' or command == 'H' or command == 'V':
+                if command == 'L':
+                    px = numbers[i]
+                    py = numbers[i + 1]
+                    if not absolute:
+                        px += x
+                        py += y
+                elif command == 'H':
+                    px = numbers[i]
+                    py = y
+                    if not absolute:
+                        px += x
+                else:
+                    px = x
+                    py = numbers[i]
+                    if not absolute:
+                        py += y
+                codes.append(LINE)
+                coords[n] = px
+                coords[n + 1] = py
+                n += 2
+
+            elif command == 'C' or command == 'S':
+                if command == 'C':
+                    c1x = numbers[i]
+                    c1y = numbers[i + 1]
+                    if not absolute:
+                        c1x += x
+                        c1y += y
+                    i += 2
+                elif last == 'C' or last == 'S':
+                    c1x = x + x - control_x
+                    c1y = y + y - control_y
+                else:
+                    c1x = x
+                    c1y = y
+                control_x = numbers[i]
+                control_y = numbers[i + 1]
+                px = numbers[i + 2]
+                py = numbers[i + 3]
+                if not absolute:
+                    control_x += x
+                    control_y += y
+                    px += x
+                    py += y
+                codes.append(CUBIC)
+                coords[n] = c1x
+                coords[n + 1] = c1y
+                coords[n + 2] = control_x
+                coords[n + 3] = control_y
+                coords[n + 4] = px
+                coords[n + 5] = py
+                n += 6
+
+            elif command == 'Q' or command == 'T':
+                if command == 'Q':
+                    control_x = numbers[i]
+                    control_y = numbers[i + 1]
+                    if not absolute:
+                        control_x += x
+                        control_y += y
+                    i += 2
+                elif last == 'Q' or last == 'T':
+                    control_x = x + x - control_x
+                    control_y = y + y - control_y
+                else:
+                    control_x = x
+                    control_y = y
+                px = numbers[i]
+                py = numbers[i + 1]
+                if not absolute:
+                    px += x
+                    py += y
+                codes.append(QUAD)
+                coords[n] = control_x
+                coords[n + 1] = control_y
+                coords[n + 2] = px
+                coords[n + 3] = py
+                n += 4
+
+            else:
+                px = numbers[i + 5]
+                py = numbers[i + 6]
+                if not absolute:
+                    px += x
+                    py += y
+                codes.append(ARC)
+                coords[n] = numbers[i]
+                coords[n + 1] = numbers[i + 1]
+                coords[n + 2] = numbers[i + 2]
+                coords[n + 3] = 1.0 if numbers[i + 3] else 0.0
+                coords[n + 4] = 1.0 if numbers[i + 4] else 0.0
+                coords[n + 5] = px
+                coords[n + 6] = py
+                n += 7
+
+            x = px
+            y = py
+            last = command
+
+    return n
+
+
+def _buffer_size(numbers):
+    # H, V and T double their values at most, plus a leading moveto
+    return 2 * len(numbers) + 2
+
+
+def parse_path_array(pathdef, current_pos=0j):
+    """Parses path data straight into a PathArray in a single pass"""
+    commands, numbers = _read_values(pathdef)
+    codes = []
+    coords = [0.0] * _buffer_size(numbers)
+    n = _read_path(commands, numbers, current_pos, codes, coords, 0)
+    return PathArray(codes, coords[:n])
+
+
+def parse_paths(pathdefs):
+    """Parses many paths into PathArrays that share one coordinate buffer"""
+    values = [_read_values(pathdef) for pathdef in pathdefs]
+    coords = [0.0] * sum([_buffer_size(numbers) for commands, numbers in values])
+    n = 0
+    spans = []
+    for commands, numbers in values:
+        codes = []
+        start = n
+        n = _read_path(commands, numbers, 0j, codes, coords, n)
+        spans.append((codes, start, n))
+    buffer = np.array(coords[:n], dtype=np.float64)
+    return [PathArray(codes, buffer[start:end]) for codes, start, end in spans]
+
+
+def parse_path(pathdef, current_pos=0j):
+    # In the SVG specs, initial movetos are absolute, even if
+    # specified as 'm'. This is the default behavior here as well.
+    # But if you pass in a current_pos variable, the initial moveto
+    # will be relative to that current_pos. This is useful.
+    return parse_path_array(pathdef, current_pos).to_path()
+
+
+def benchmark(filenames=[], repeat=20):
+    """Parse throughput in MB/s on the path data in the tests, plus any SVG files given"""
+    from time import time
+    from .tests.fixtures import PATHS
+    pathdefs = list(PATHS)
+    if filenames:
+        from xml.dom import minidom
+        for filename in filenames:
+            doc = minidom.parse(filename)
+            pathdefs += [p.getAttribute('d') for p in doc.getElementsByTagName('path')]
+    size = sum([len(d) for d in pathdefs]) * repeat / (1024.0 * 1024.0)
+    print "%s paths, %.2fMB of path data" % (len(pathdefs) * repeat, size)
+    for name, parse in [('parse_path_regex', lambda ds: [parse_path_regex(d) for d in ds]),
+                        ('parse_path', lambda ds: [parse_path(d) for d in ds]),
+                        ('parse_path_array', lambda ds: [parse_path_array(d) for d in ds]),
+                        ('parse_paths', parse_paths)]:
+        start = time()
+        for i in range(repeat):
+            parse(pathdefs)
+        elapsed = time() - start
+        print "  %s: %.3fs, %.2fMB/s" % (name, elapsed, size / elapsed)
+
+
+if __name__ == '__main__':
+    # e.g. python -m path.parser ../climate_change/svg/*.svg
+    import sys
+    benchmark(sys.argv[1:])
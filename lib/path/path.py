@@ -1,6 +1,8 @@
 from __future__ import division
+from bisect import bisect_left
 from math import sqrt, cos, sin, acos, degrees, radians, log
 from collections import MutableSequence
+import numpy as np
 
 
 # This file contains classes for the different types of SVG path segments as
@@ -30,8 +32,151 @@ def segment_length(curve, start, end, start_point, end_point, error, min_depth,
     return length2
 
 
+# Gauss-Legendre quadrature integrates the speed along a segment with a
+# fixed number of derivative evaluations; segments where halving doesn't
+# agree within the error are subdivided adaptively.
+
+GAUSS_ORDER = 16
+MAX_DEPTH = 20
+GAUSS_RULES = {}
+
+
+def gauss_rule(order=GAUSS_ORDER):
+    """Nodes and weights on [0, 1]"""
+    if order not in GAUSS_RULES:
+        nodes, weights = np.polynomial.legendre.leggauss(order)
+        GAUSS_RULES[order] = ((nodes + 1) / 2, weights / 2)
+    return GAUSS_RULES[order]
+
+
+def _quadrature(speed, rows, starts, ends, rule):
+    nodes, weights = rule
+    span = ends - starts
+    t = starts[:, None] + span[:, None] * nodes
+    return span * (speed(rows, t) * weights).sum(axis=1)
+
+
+def _adaptive_length(speed, row, start, end, whole, error, rule, depth):
+    mid = (start + end) / 2
+    halves = _quadrature(speed, [row, row], np.array([start, mid]), np.array([mid, end]), rule)
+    total = halves[0] + halves[1]
+    if depth >= MAX_DEPTH or abs(total - whole) <= error * abs(total):
+        return total
+    return (_adaptive_length(speed, row, start, mid, halves[0], error, rule, depth + 1) +
+            _adaptive_length(speed, row, mid, end, halves[1], error, rule, depth + 1))
+
+
+def _integrate(speed, count, error, rule):
+    # one vectorized pass over every segment, halves included to check the error
+    zeros = np.zeros(count)
+    ones = np.ones(count)
+    halves = np.full(count, 0.5)
+    rows = np.arange(count)
+    whole = _quadrature(speed, rows, zeros, ones, rule)
+    first = _quadrature(speed, rows, zeros, halves, rule)
+    second = _quadrature(speed, rows, halves, ones, rule)
+    total = first + second
+    for row in np.flatnonzero(np.abs(total - whole) > error * np.abs(total)):
+        total[row] = (_adaptive_length(speed, row, 0.0, 0.5, first[row], error, rule, 1) +
+                      _adaptive_length(speed, row, 0.5, 1.0, second[row], error, rule, 1))
+    return total
+
+
+def _bezier_speed(controls):
+    p0, p1, p2, p3 = [controls[:, i] for i in range(4)]
+    d0 = p1 - p0
+    d1 = p2 - p1
+    d2 = p3 - p2
+
+    def speed(rows, t):
+        mt = 1 - t
+        return np.abs(3 * (mt * mt * d0[rows, None] + 2 * mt * t * d1[rows, None] + t * t * d2[rows, None]))
+    return speed
+
+
+def _arc_speed(params):
+    # rotation doesn't change the speed along an ellipse
+    rx = params[:, 0]
+    ry = params[:, 1]
+    theta = np.radians(params[:, 2])
+    delta = np.radians(params[:, 3])
+
+    def speed(rows, t):
+        angle = theta[rows, None] + delta[rows, None] * t
+        return np.abs(delta[rows, None]) * np.hypot(rx[rows, None] * np.sin(angle), ry[rows, None] * np.cos(angle))
+    return speed
+
+
+def segment_lengths(segments, error=ERROR, order=GAUSS_ORDER):
+    """Lengths of many segments at once; error is the relative error allowed
+    for curves, order the number of Gauss-Legendre nodes per evaluation"""
+    lengths = np.zeros(len(segments))
+    curves = []
+    controls = []
+    arcs = []
+    params = []
+    for i, segment in enumerate(segments):
+        if isinstance(segment, Line):
+            lengths[i] = abs(segment.end - segment.start)
+        elif isinstance(segment, CubicBezier):
+            curves.append(i)
+            controls.append((segment.start, segment.control1, segment.control2, segment.end))
+        elif isinstance(segment, QuadraticBezier):
+            # the same curve as a cubic
+            curves.append(i)
+            controls.append((segment.start, segment.start + 2 * (segment.control - segment.start) / 3,
+                             segment.end + 2 * (segment.control - segment.end) / 3, segment.end))
+        elif isinstance(segment, Arc):
+            arcs.append(i)
+            params.append((segment.radius.real, segment.radius.imag, segment.theta, segment.delta))
+        else:
+            lengths[i] = segment.length(error=error)
+    rule = gauss_rule(order)
+    if curves:
+        lengths[curves] = _integrate(_bezier_speed(np.array(controls, dtype=np.complex128)), len(curves), error, rule)
+    if arcs:
+        lengths[arcs] = _integrate(_arc_speed(np.array(params, dtype=np.float64)), len(arcs), error, rule)
+    return lengths
+
+
+def segment_points(segment, positions):
+    """Complex points of a segment at an array of positions"""
+    positions = np.asarray(positions, dtype=np.float64)
+    if isinstance(segment, Arc):
+        x, y = segment._coordinates(positions)
+        return x + 1j * y
+    return np.asarray(segment.point(positions), dtype=np.complex128)
+
+
+def flatten_segment(segment, tolerance, min_parts=4, max_depth=16):
+    """Positions along a segment for a polyline whose chords are within
+    tolerance of the curve, from 0 to 1 inclusive"""
+    if isinstance(segment, Line):
+        return np.array([0.0, 1.0])
+    # start from a few parts so a curve crossing its own chord isn't taken as flat
+    positions = np.linspace(0, 1, min_parts + 1)
+    points = segment_points(segment, positions)
+    for depth in range(max_depth):
+        middles = (positions[:-1] + positions[1:]) / 2
+        middle_points = segment_points(segment, middles)
+        chords = points[1:] - points[:-1]
+        offsets = middle_points - points[:-1]
+        lengths = np.abs(chords)
+        # distance from the middle of the curve to its chord
+        cross = np.abs(chords.real * offsets.imag - chords.imag * offsets.real)
+        errors = np.where(lengths > 0, cross / np.where(lengths > 0, lengths, 1), np.abs(offsets))
+        split = errors > tolerance
+        if not split.any():
+            break
+        positions = np.insert(positions, np.flatnonzero(split) + 1, middles[split])
+        points = np.insert(points, np.flatnonzero(split) + 1, middle_points[split])
+    return positions
+
+
 class Line(object):
 
+    __slots__ = ('start', 'end')
+
     def __init__(self, start, end):
         self.start = start
         self.end = end
@@ -59,6 +204,9 @@ class Line(object):
 
 
 class CubicBezier(object):
+
+    __slots__ = ('start', 'control1', 'control2', 'end')
+
     def __init__(self, start, control1, control2, end):
         self.start = start
         self.control1 = control1
@@ -97,12 +245,13 @@ class CubicBezier(object):
 
     def length(self, error=ERROR, min_depth=MIN_DEPTH):
         """Calculate the length of the path up to a certain position"""
-        start_point = self.point(0)
-        end_point = self.point(1)
-        return segment_length(self, 0, 1, start_point, end_point, error, min_depth, 0)
+        return float(segment_lengths([self], error)[0])
 
 
 class QuadraticBezier(object):
+
+    __slots__ = ('start', 'control', 'end')
+
     def __init__(self, start, control, end):
         self.start = start
         self.end = end
@@ -167,6 +316,9 @@ class QuadraticBezier(object):
 
 class Arc(object):
 
+    __slots__ = ('start', 'radius', 'rotation', 'arc', 'sweep', 'end',
+                 'center', 'theta', 'delta', 'cosr', 'sinr')
+
     def __init__(self, start, radius, rotation, arc, sweep, end):
         """radius is complex, rotation is in degrees,
            large and sweep are 1 or 0 (True/False also work)"""
@@ -200,8 +352,9 @@ class Arc(object):
         # Conversion from endpoint to center parameterization
         # http://www.w3.org/TR/SVG/implnote.html#ArcImplementationNotes
 
-        cosr = cos(radians(self.rotation))
-        sinr = sin(radians(self.rotation))
+        # The rotation matrix is kept for point()
+        self.cosr = cosr = cos(radians(self.rotation))
+        self.sinr = sinr = sin(radians(self.rotation))
         dx = (self.start.real - self.end.real) / 2
         dy = (self.start.imag - self.end.imag) / 2
         x1prim = cosr * dx + sinr * dy
@@ -265,8 +418,8 @@ class Arc(object):
 
     def point(self, pos):
         angle = radians(self.theta + (self.delta * pos))
-        cosr = cos(radians(self.rotation))
-        sinr = sin(radians(self.rotation))
+        cosr = self.cosr
+        sinr = self.sinr
 
         x = (cosr * cos(angle) * self.radius.real - sinr * sin(angle) *
              self.radius.imag + self.center.real)
@@ -274,14 +427,24 @@ class Arc(object):
              self.radius.imag + self.center.imag)
         return complex(x, y)
 
+    def _coordinates(self, positions):
+        angles = np.radians(self.theta + self.delta * np.asarray(positions, dtype=np.float64))
+        cos_angles = np.cos(angles) * self.radius.real
+        sin_angles = np.sin(angles) * self.radius.imag
+        x = self.cosr * cos_angles - self.sinr * sin_angles + self.center.real
+        y = self.sinr * cos_angles + self.cosr * sin_angles + self.center.imag
+        return x, y
+
+    def points(self, positions):
+        """The x,y points at an array of positions, as an (N, 2) array"""
+        return np.column_stack(self._coordinates(positions))
+
     def length(self, error=ERROR, min_depth=MIN_DEPTH):
         """The length of an elliptical arc segment requires numerical
-        integration, and in that case it's simpler to just do a geometric
-        approximation, as for cubic bezier curves.
+        integration, done with Gauss-Legendre quadrature as for cubic
+        bezier curves.
         """
-        start_point = self.point(0)
-        end_point = self.point(1)
-        return segment_length(self, 0, 1, start_point, end_point, error, min_depth, 0)
+        return float(segment_lengths([self], error)[0])
 
 
 class Path(MutableSequence):
@@ -294,6 +457,8 @@ class Path(MutableSequence):
         self._segments = list(segments)
         self._length = None
         self._lengths = None
+        self._ends = None
+        self._flattened = {}
         if 'closed' in kw:
             self.closed = kw['closed']
 
@@ -303,14 +468,17 @@ class Path(MutableSequence):
     def __setitem__(self, index, value):
         self._segments[index] = value
         self._length = None
+        self._flattened = {}
 
     def __delitem__(self, index):
         del self._segments[index]
         self._length = None
+        self._flattened = {}
 
     def insert(self, index, value):
         self._segments.insert(index, value)
         self._length = None
+        self._flattened = {}
 
     def reverse(self):
         # Reversing the order of a path would require reversing each element
@@ -343,9 +511,15 @@ class Path(MutableSequence):
         if self._length is not None:
             return
 
-        lengths = [each.length(error=error, min_depth=min_depth) for each in self._segments]
+        lengths = segment_lengths(self._segments, error=error).tolist()
         self._length = sum(lengths)
         self._lengths = [each / self._length for each in lengths]
+        # Running totals of the fractions: where each segment ends
+        self._ends = []
+        segment_end = 0
+        for each in self._lengths:
+            segment_end += each
+            self._ends.append(segment_end)
 
     def point(self, pos, error=ERROR):
 
@@ -357,16 +531,60 @@ class Path(MutableSequence):
 
         self._calc_lengths(error=error)
         # Find which segment the point we search for is located on:
-        segment_start = 0
-        for index, segment in enumerate(self._segments):
-            segment_end = segment_start + self._lengths[index]
-            if segment_end >= pos:
-                # This is the segment! How far in on the segment is the point?
-                segment_pos = (pos - segment_start) / (segment_end - segment_start)
-                break
-            segment_start = segment_end
-
-        return segment.point(segment_pos)
+        index = min(bisect_left(self._ends, pos), len(self._segments) - 1)
+        segment_start = self._ends[index - 1] if index > 0 else 0
+        segment_end = self._ends[index]
+        # How far in on the segment is the point?
+        segment_pos = (pos - segment_start) / (segment_end - segment_start)
+        return self._segments[index].point(segment_pos)
+
+    def points(self, positions, error=ERROR):
+        """The x,y points at an array of positions, as an (N, 2) array"""
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1)
+        self._calc_lengths(error=error)
+        ends = np.array(self._ends)
+        starts = np.concatenate(([0.0], ends[:-1]))
+        indexes = np.minimum(np.searchsorted(ends, positions), len(ends) - 1)
+        spans = ends[indexes] - starts[indexes]
+        segment_positions = (positions - starts[indexes]) / np.where(spans > 0, spans, 1)
+        # Same shortcuts as point()
+        segment_positions[positions == 0.0] = 0.0
+        indexes[positions == 1.0] = len(ends) - 1
+        segment_positions[positions == 1.0] = 1.0
+
+        # Evaluate each segment once for all of its positions
+        order = np.argsort(indexes, kind='mergesort')
+        bounds = np.searchsorted(indexes[order], np.arange(len(ends) + 1))
+        points = np.empty(len(positions), dtype=np.complex128)
+        for index in np.flatnonzero(np.diff(bounds)):
+            selected = order[bounds[index]:bounds[index + 1]]
+            points[selected] = segment_points(self._segments[index], segment_positions[selected])
+        return np.column_stack((points.real, points.imag))
+
+    def flatten(self, tolerance=0.1):
+        """The path as polylines within tolerance of the curves: a list with
+        an (N, 2) array for each subpath. Results are kept per tolerance,
+        so treat the arrays as read only."""
+        if tolerance in self._flattened:
+            return self._flattened[tolerance]
+        subpaths = []
+        current = None
+        current_pos = None
+        for segment in self._segments:
+            if current is None or segment.start != current_pos:
+                current = [np.array([segment.start])]
+                subpaths.append(current)
+            positions = flatten_segment(segment, tolerance)
+            current.append(segment_points(segment, positions[1:]))
+            current_pos = segment.end
+        polylines = []
+        for subpath in subpaths:
+            points = np.concatenate(subpath)
+            polyline = np.column_stack((points.real, points.imag))
+            polyline.setflags(write=False)
+            polylines.append(polyline)
+        self._flattened[tolerance] = polylines
+        return polylines
 
     def length(self, error=ERROR, min_depth=MIN_DEPTH):
         self._calc_lengths(error, min_depth)
@@ -451,3 +669,38 @@ class Path(MutableSequence):
             parts.append('Z')
 
         return ' '.join(parts)
+
+
+def benchmark(repeat=3, error=ERROR):
+    """Compares Gauss-Legendre lengths with the recursive segment_length on the test paths"""
+    from time import time
+    from .parser import parse_path
+    from .tests.fixtures import PATHS
+    segments = [segment for pathdef in PATHS for segment in parse_path(pathdef)
+                if not isinstance(segment, Line)]
+    print "%s curves, %s repeats" % (len(segments), repeat)
+
+    start = time()
+    for i in range(repeat):
+        recursive = [segment_length(segment, 0, 1, segment.point(0), segment.point(1), error, MIN_DEPTH, 0)
+                     for segment in segments]
+    print "  segment_length: %.4fs" % (time() - start)
+
+    start = time()
+    for i in range(repeat):
+        gauss = [segment.length(error) for segment in segments]
+    print "  length per segment: %.4fs" % (time() - start)
+
+    start = time()
+    for i in range(repeat):
+        vectorized = segment_lengths(segments, error)
+    print "  segment_lengths: %.4fs" % (time() - start)
+
+    recursive = np.array(recursive)
+    difference = np.abs(vectorized - recursive) / recursive
+    print "  largest relative difference: %.3g" % difference.max()
+
+
+if __name__ == '__main__':
+    # e.g. python -m path.path
+    benchmark()
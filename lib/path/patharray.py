@@ -0,0 +1,186 @@
+from __future__ import division
+import numpy as np
+
+from .path import Path, Line, Arc, CubicBezier, QuadraticBezier
+
+# A compact representation of a path: one command code per command and a
+# single contiguous float64 buffer holding every command's numbers.
+# Segment objects are only created when a segment is asked for.
+
+MOVE = 0
+LINE = 1
+CUBIC = 2
+QUAD = 3
+ARC = 4
+CLOSE = 5
+
+LETTERS = 'MLCQAZ'
+
+# number of floats stored per command:
+# M x,y  L x,y  C c1x,c1y,c2x,c2y,x,y  Q cx,cy,x,y  A rx,ry,rotation,arc,sweep,x,y  Z
+SIZES = np.array([2, 2, 6, 4, 7, 0], dtype=np.intp)
+
+# which of a command's floats are x and y coordinates (arc radii are scaled too)
+X_SLOTS = ((0,), (0,), (0, 2, 4), (0, 2), (0, 5), ())
+Y_SLOTS = ((1,), (1,), (1, 3, 5), (1, 3), (1, 6), ())
+
+
+class PathArray(object):
+
+    __slots__ = ('codes', 'coords', 'offsets', '_x', '_y')
+
+    def __init__(self, codes, coords, offsets=None):
+        self.codes = np.asarray(codes, dtype=np.uint8)
+        self.coords = np.asarray(coords, dtype=np.float64)
+        if offsets is None:
+            offsets = np.zeros(len(self.codes), dtype=np.intp)
+            if len(self.codes):
+                offsets[1:] = np.cumsum(SIZES[self.codes])[:-1]
+        self.offsets = offsets
+        self._x = None
+        self._y = None
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __repr__(self):
+        return 'PathArray(%s)' % self.d()
+
+    def __eq__(self, other):
+        if not isinstance(other, PathArray):
+            return NotImplemented
+        return np.array_equal(self.codes, other.codes) and np.array_equal(self.coords, other.coords)
+
+    def __ne__(self, other):
+        if not isinstance(other, PathArray):
+            return NotImplemented
+        return not self == other
+
+    @classmethod
+    def from_path(cls, path):
+        codes = []
+        coords = []
+        current_pos = None
+        segments = list(path)
+        if path.closed and isinstance(segments[-1], Line) and segments[-1].end == segments[0].start:
+            # the closing line is implied by CLOSE
+            segments.pop()
+        for segment in segments:
+            if segment.start != current_pos:
+                codes.append(MOVE)
+                coords.extend((segment.start.real, segment.start.imag))
+            if isinstance(segment, Line):
+                codes.append(LINE)
+                coords.extend((segment.end.real, segment.end.imag))
+            elif isinstance(segment, CubicBezier):
+                codes.append(CUBIC)
+                coords.extend((segment.control1.real, segment.control1.imag,
+                               segment.control2.real, segment.control2.imag,
+                               segment.end.real, segment.end.imag))
+            elif isinstance(segment, QuadraticBezier):
+                codes.append(QUAD)
+                coords.extend((segment.control.real, segment.control.imag,
+                               segment.end.real, segment.end.imag))
+            elif isinstance(segment, Arc):
+                codes.append(ARC)
+                coords.extend((segment.radius.real, segment.radius.imag, segment.rotation,
+                               float(segment.arc), float(segment.sweep),
+                               segment.end.real, segment.end.imag))
+            current_pos = segment.end
+        if path.closed:
+            codes.append(CLOSE)
+        return cls(codes, coords)
+
+    def _coordinate_indexes(self):
+        # flat buffer indexes of every x and every y coordinate, computed once
+        if self._x is None:
+            xs = []
+            ys = []
+            for code, offset in zip(self.codes.tolist(), self.offsets.tolist()):
+                xs.extend(offset + i for i in X_SLOTS[code])
+                ys.extend(offset + i for i in Y_SLOTS[code])
+            self._x = np.array(xs, dtype=np.intp)
+            self._y = np.array(ys, dtype=np.intp)
+        return self._x, self._y
+
+    def copy(self):
+        return PathArray(self.codes.copy(), self.coords.copy(), self.offsets)
+
+    def scale(self, sx, sy=None):
+        """Scale in place, directly on the coordinate buffer"""
+        if sy is None:
+            sy = sx
+        x, y = self._coordinate_indexes()
+        self.coords[x] *= sx
+        self.coords[y] *= sy
+        return self
+
+    def translate(self, dx, dy):
+        """Translate in place; arc radii are left alone"""
+        x, y = self._coordinate_indexes()
+        arcs = self.offsets[self.codes == ARC]
+        self.coords[x] += dx
+        self.coords[y] += dy
+        self.coords[arcs] -= dx
+        self.coords[arcs + 1] -= dy
+        return self
+
+    def points(self):
+        """End points of every command as an (N, 2) array"""
+        drawn = self.codes != CLOSE
+        ends = self.offsets[drawn] + SIZES[self.codes[drawn]] - 2
+        return np.column_stack((self.coords[ends], self.coords[ends + 1]))
+
+    def commands(self):
+        """Commands as lists of a letter followed by (x, y) tuples; arcs
+        are ['A', (rx, ry), rotation, arc, sweep, (x, y)]"""
+        commands = []
+        c = self.coords.tolist()
+        for code, o in zip(self.codes.tolist(), self.offsets.tolist()):
+            if code == ARC:
+                commands.append(['A', (c[o], c[o+1]), c[o+2], int(c[o+3]), int(c[o+4]), (c[o+5], c[o+6])])
+            else:
+                command = [LETTERS[code]]
+                for i in range(o, o + SIZES[code], 2):
+                    command.append((c[i], c[i+1]))
+                commands.append(command)
+        return commands
+
+    def segments(self):
+        """Yields segment objects, creating each one only when it is reached"""
+        c = self.coords
+        current_pos = 0j
+        start_pos = 0j
+        for code, o in zip(self.codes.tolist(), self.offsets.tolist()):
+            if code == MOVE:
+                current_pos = start_pos = complex(c[o], c[o+1])
+                continue
+            if code == CLOSE:
+                if current_pos != start_pos:
+                    yield Line(current_pos, start_pos)
+                current_pos = start_pos
+                continue
+            if code == LINE:
+                end = complex(c[o], c[o+1])
+                segment = Line(current_pos, end)
+            elif code == CUBIC:
+                end = complex(c[o+4], c[o+5])
+                segment = CubicBezier(current_pos, complex(c[o], c[o+1]), complex(c[o+2], c[o+3]), end)
+            elif code == QUAD:
+                end = complex(c[o+2], c[o+3])
+                segment = QuadraticBezier(current_pos, complex(c[o], c[o+1]), end)
+            else:
+                end = complex(c[o+5], c[o+6])
+                segment = Arc(current_pos, complex(c[o], c[o+1]), c[o+2], c[o+3], c[o+4], end)
+            yield segment
+            current_pos = end
+
+    def to_path(self):
+        path = Path(*self.segments())
+        # like parse_path, a path with any Z is closed if it can be
+        if len(path) and (self.codes == CLOSE).any() and path._is_closable():
+            path.closed = True
+        return path
+
+    def d(self):
+        return self.to_path().d() if len(self.codes) else ''
@@ -0,0 +1,22 @@
+# Path data shared by the tests and the parser benchmark, mostly examples from the SVG spec
+
+PATHS = [
+    'M 100 100 L 300 100 L 200 300 z',
+    'M 0 0 L 50 20 M 100 100 L 300 100 L 200 300 z',
+    'M 100 200 L 200 100 -100 -200',
+    'M100,200 C100,100 250,100 250,200 S400,300 400,200',
+    'M100,500 C25,400 475,400 400,500',
+    'M600,800 C625,700 725,700 750,800 S875,900 900,800',
+    'M200,300 Q400,50 600,300 T1000,300',
+    'M300,200 h-150 a150,150 0 1,0 150,-150 z',
+    'M275,175 v-150 a150,150 0 0,0 -150,150 L 275,175 z',
+    'M600,350 l 50,-25 a25,25 -30 0,1 50,-25 l 50,-25 a25,50 -30 0,1 50,-25 l 50,-25 '
+    'a25,75 -30 0,1 50,-25 l 50,-25 a25,100 -30 0,1 50,-25 l 50,-25',
+    'M 0 0 L 50 20 m 50 80 L 300 100 L 200 300 z',
+    'M100,200 s 150,-100 150,0',
+    'M100,200 t 150,0',
+    'M100,200c10-5,20-10,30-20',
+    'M-3.4e38 3.4E+38L-3.4E-38,3.4e-38',
+    'M0 0L3.4E2-10L100.0,100M100,100l100,-100',
+    'M10.5.5L.5.5.25-.25zm1,1',
+]
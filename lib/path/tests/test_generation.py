@@ -1,7 +1,9 @@
 from __future__ import division
 import unittest
 from ..path import CubicBezier, QuadraticBezier, Line, Arc, Path
-from ..parser import parse_path
+from ..parser import parse_path, parse_path_array
+from ..writer import PathWriter
+from .fixtures import PATHS
 
 
 class TestGeneration(unittest.TestCase):
@@ -34,3 +36,32 @@ class TestGeneration(unittest.TestCase):
         # and syntax will change.
         self.assertEqual(parse_path('M0 0L3.4E2-10L100.0,100M100,100l100,-100').d(),
                          'M 0,0 L 340,-10 L 100,100 L 200,0')
+
+
+class TestWriter(unittest.TestCase):
+
+    def test_precision(self):
+        writer = PathWriter(precision=2, relative=False)
+        writer.move_to(1.0, -0.001)
+        writer.curve_to(1.234, 5.678, 10, 20.5, 30.004, 40)
+        self.assertEqual(writer.getvalue(), 'M1,0C1.23,5.68 10,20.5 30,40')
+        self.assertEqual(writer.commands(), ['M1,0', 'C1.23,5.68 10,20.5 30,40'])
+
+    def test_relative(self):
+        writer = PathWriter()
+        writer.move_to(1000, 1000)
+        writer.line_to(1001, 1002)
+        writer.line_to(1001, 1010)
+        writer.quad_to(1000, 1000, 10, 10)
+        writer.close()
+        writer.line_to(1000.5, 1000.5)
+        self.assertEqual(writer.commands(), ['M1000,1000', 'l1,2', 'v8', 'Q1000,1000 10,10', 'Z', 'l.5,.5'])
+
+    def test_path_array(self):
+        # all but the path with values too small for the precision
+        for pathdef in PATHS:
+            if 'e' in pathdef.lower():
+                continue
+            path = parse_path(pathdef)
+            written = PathWriter(precision=6).write_path_array(parse_path_array(pathdef)).getvalue()
+            self.assertEqual(parse_path(written), path)
@@ -1,7 +1,8 @@
 from __future__ import division
 import unittest
 from ..path import CubicBezier, QuadraticBezier, Line, Arc, Path
-from ..parser import parse_path
+from ..parser import parse_path, parse_path_array, parse_path_regex, parse_paths
+from .fixtures import PATHS
 
 
 class TestParser(unittest.TestCase):
@@ -142,3 +143,28 @@ class TestParser(unittest.TestCase):
 
     def test_errors(self):
         self.assertRaises(ValueError, parse_path, 'M 100 100 L 200 200 Z 100 200')
+
+
+class ArrayParserTest(unittest.TestCase):
+
+    def test_same_as_regex_parser(self):
+        for pathdef in PATHS:
+            self.assertEqual(parse_path(pathdef), parse_path_regex(pathdef))
+            self.assertEqual(parse_path(pathdef).closed, parse_path_regex(pathdef).closed)
+        self.assertEqual(parse_path('L 10 10', 5 + 5j), parse_path_regex('L 10 10', 5 + 5j))
+
+    def test_batch(self):
+        pathArrays = parse_paths(PATHS)
+        self.assertEqual(len(pathArrays), len(PATHS))
+        for pathdef, pathArray in zip(PATHS, pathArrays):
+            self.assertEqual(pathArray, parse_path_array(pathdef))
+        self.assertTrue(pathArrays[1].coords.base is pathArrays[0].coords.base)
+
+    def test_compact_numbers(self):
+        self.assertEqual(parse_path('M.5.5L1.5.5.25-.25'),
+                         Path(Line(0.5 + 0.5j, 1.5 + 0.5j), Line(1.5 + 0.5j, 0.25 - 0.25j)))
+
+    def test_array_errors(self):
+        self.assertRaises(ValueError, parse_path_array, '100 100 L 200 200')
+        self.assertRaises(ValueError, parse_path_array, 'M 100 100 L 200')
+        self.assertRaises(ValueError, parse_path_array, 'M 100 100 L 200 2x0')
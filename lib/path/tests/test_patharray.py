@@ -0,0 +1,56 @@
+from __future__ import division
+import unittest
+
+from ..path import CubicBezier, QuadraticBezier, Line, Arc, Path
+from ..parser import parse_path
+from ..patharray import PathArray, MOVE, LINE, CUBIC, QUAD, ARC, CLOSE
+
+
+class RoundTripTest(unittest.TestCase):
+
+    def test_segments(self):
+        path = parse_path('M100,200 C100,100 250,100 250,200 S400,300 400,200 '
+                          'Q500,100 600,200 A25,100 -30 0,1 650,300 L700,300 z')
+        pathArray = PathArray.from_path(path)
+        self.assertEqual(pathArray.codes.tolist(), [MOVE, CUBIC, CUBIC, QUAD, ARC, LINE, CLOSE])
+        self.assertEqual(len(pathArray.coords), 2 + 6 + 6 + 4 + 7 + 2)
+        self.assertEqual(pathArray.to_path(), path)
+        self.assertTrue(pathArray.to_path().closed)
+
+    def test_subpaths(self):
+        path = parse_path('M0,0 L10,0 L10,10 z M20,20 L30,20')
+        pathArray = PathArray.from_path(path)
+        self.assertEqual(pathArray.commands(), [
+            ['M', (0.0, 0.0)], ['L', (10.0, 0.0)], ['L', (10.0, 10.0)], ['L', (0.0, 0.0)],
+            ['M', (20.0, 20.0)], ['L', (30.0, 20.0)]])
+        self.assertEqual(pathArray.to_path(), path)
+
+    def test_empty(self):
+        pathArray = PathArray.from_path(Path())
+        self.assertEqual(len(pathArray), 0)
+        self.assertEqual(pathArray.d(), '')
+
+
+class TransformTest(unittest.TestCase):
+
+    def test_scale(self):
+        pathArray = PathArray.from_path(parse_path('M1,2 C3,4 5,6 7,8 A2,3 0 0,1 9,10'))
+        pathArray.scale(2, 3)
+        self.assertEqual(pathArray.to_path(), Path(
+            CubicBezier(2+6j, 6+12j, 10+18j, 14+24j),
+            Arc(14+24j, 4+9j, 0, 0, 1, 18+30j)))
+
+    def test_translate(self):
+        pathArray = PathArray.from_path(parse_path('M1,2 Q3,4 5,6 A2,3 0 0,1 9,10'))
+        pathArray.translate(10, 20)
+        self.assertEqual(pathArray.to_path(), Path(
+            QuadraticBezier(11+22j, 13+24j, 15+26j),
+            Arc(15+26j, 2+3j, 0, 0, 1, 19+30j)))
+
+    def test_points(self):
+        pathArray = PathArray.from_path(parse_path('M0,0 L1,2 Q3,4 5,6 z'))
+        self.assertEqual(pathArray.points().tolist(), [[0, 0], [1, 2], [5, 6]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@ from __future__ import division
 import unittest
 from math import sqrt, pi
 
-from ..path import CubicBezier, QuadraticBezier, Line, Arc, Path
+from ..path import CubicBezier, QuadraticBezier, Line, Arc, Path, segment_lengths
 
 
 # Most of these test points are not calculated serparately, as that would
@@ -434,6 +434,14 @@ class ArcTest(unittest.TestCase):
             225.6910319606926, 1, 1,
             (-624.6375539637027+896.5483089399895j))
 
+    def test_vectorized_points(self):
+        arc = Arc(300 + 200j, 150 + 100j, -30, 1, 0, 150 + 50j)
+        positions = [0, 0.1, 0.25, 0.5, 0.9, 1]
+        points = arc.points(positions)
+        self.assertEqual(points.shape, (len(positions), 2))
+        for pos, (x, y) in zip(positions, points):
+            self.assertAlmostEqual(complex(x, y), arc.point(pos))
+
 
 class TestPath(unittest.TestCase):
 
@@ -543,3 +551,47 @@ class TestPath(unittest.TestCase):
         # It's not equal to a list of it's segments
         self.assertTrue(path1 != path1[:])
         self.assertFalse(path1 == path1[:])
+
+    def test_points(self):
+        path = Path(Line(0j, 100 + 0j),
+                    Arc(100 + 0j, 50 + 50j, 0, 0, 1, 100 + 100j),
+                    CubicBezier(100 + 100j, 50 + 150j, 0 + 50j, 0 + 100j),
+                    QuadraticBezier(0 + 100j, 0 + 50j, 0j))
+        positions = [0, 0.05, 0.5, 0.1, 0.3, 0.7, 0.99, 1]
+        points = path.points(positions)
+        self.assertEqual(points.shape, (len(positions), 2))
+        for pos, (x, y) in zip(positions, points):
+            point = path.point(pos)
+            self.assertAlmostEqual(x, point.real)
+            self.assertAlmostEqual(y, point.imag)
+        self.assertAlmostEqual(path.point(1.0 - 1e-17), 0j)
+
+    def test_segment_lengths(self):
+        segments = [Line(0j, 100 + 0j),
+                    Arc(100 + 0j, 50 + 50j, 0, 0, 1, 100 + 100j),
+                    CubicBezier(100 + 100j, 50 + 150j, 0 + 50j, 0 + 100j),
+                    QuadraticBezier(0 + 100j, 0 + 50j, 0j)]
+        lengths = segment_lengths(segments)
+        for segment, length in zip(segments, lengths):
+            self.assertAlmostEqual(segment.length(), length)
+        self.assertAlmostEqual(lengths[1], pi * 50)
+        self.assertAlmostEqual(Path(*segments).length(), sum(lengths))
+
+    def test_flatten(self):
+        path = Path(Line(0j, 100 + 0j),
+                    Arc(100 + 0j, 50 + 50j, 0, 0, 1, 100 + 100j),
+                    CubicBezier(100 + 100j, 50 + 150j, 0 + 50j, 0 + 100j),
+                    Line(200 + 200j, 300 + 200j))
+        polylines = path.flatten(0.01)
+        self.assertEqual(len(polylines), 2)
+        self.assertEqual(polylines[0][0].tolist(), [0, 0])
+        self.assertEqual(polylines[0][-1].tolist(), [0, 100])
+        self.assertEqual(polylines[1].tolist(), [[200, 200], [300, 200]])
+        # every vertex is on the curve and every chord is close to it
+        arc = polylines[0][(polylines[0][:, 0] > 100) & (polylines[0][:, 1] < 100)]
+        for x, y in arc:
+            self.assertAlmostEqual(abs(complex(x, y) - (100 + 50j)), 50)
+        self.assertTrue(len(path.flatten(1)[0]) < len(polylines[0]))
+        self.assertTrue(path.flatten(0.01) is polylines)
+        del path[-1]
+        self.assertEqual(len(path.flatten(0.01)), 1)
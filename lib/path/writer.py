@@ -0,0 +1,138 @@
+# Writes SVG path data with a fixed number of decimals into one buffer.
+# Every command is written in whichever of its absolute or relative forms
+# is shorter; relative values are taken between rounded positions so
+# rounding errors don't add up along the path.
+
+from io import StringIO
+import numpy as np
+
+from .patharray import MOVE, LINE, CUBIC, QUAD, ARC, CLOSE
+
+PRECISION = 3
+
+
+def format_number(value, precision=PRECISION):
+    text = u'%.*f' % (precision, value)
+    if precision > 0:
+        text = text.rstrip(u'0').rstrip(u'.')
+    if text == u'-0':
+        return u'0'
+    # the leading zero is optional in path data
+    if text.startswith(u'0.'):
+        return text[1:]
+    if text.startswith(u'-0.'):
+        return u'-' + text[2:]
+    return text
+
+
+class PathWriter(object):
+
+    def __init__(self, precision=PRECISION, relative=True):
+        self.precision = precision
+        self.relative = relative
+        self.buffer = StringIO()
+        self.offsets = []
+        # pen position and start of the subpath, both rounded
+        self.x = 0.0
+        self.y = 0.0
+        self.start_x = 0.0
+        self.start_y = 0.0
+
+    def _round(self, value):
+        return round(value, self.precision)
+
+    def _pairs(self, values):
+        # 'x,y x,y' for a flat list of values
+        numbers = [format_number(value, self.precision) for value in values]
+        return u' '.join([numbers[i] + u',' + numbers[i + 1] for i in range(0, len(numbers), 2)])
+
+    def _write(self, text):
+        self.offsets.append(self.buffer.tell())
+        self.buffer.write(text)
+
+    def _command(self, letter, values, prefix=u''):
+        """Writes a command whose values are x,y pairs, after any values in prefix"""
+        values = [self._round(value) for value in values]
+        text = letter + prefix + self._pairs(values)
+        if self.relative and letter != u'M':
+            relative = [value - (self.x if i % 2 == 0 else self.y) for i, value in enumerate(values)]
+            relative_text = letter.lower() + prefix + self._pairs(relative)
+            if len(relative_text) < len(text):
+                text = relative_text
+        self._write(text)
+        self.x = values[-2]
+        self.y = values[-1]
+
+    def move_to(self, x, y):
+        self._command(u'M', (x, y))
+        self.start_x = self.x
+        self.start_y = self.y
+
+    def line_to(self, x, y):
+        x = self._round(x)
+        y = self._round(y)
+        if y == self.y and x != self.x:
+            self._single(u'H', x, self.x)
+        elif x == self.x and y != self.y:
+            self._single(u'V', y, self.y)
+        else:
+            self._command(u'L', (x, y))
+
+    def _single(self, letter, value, current):
+        text = letter + format_number(value, self.precision)
+        if self.relative:
+            relative_text = letter.lower() + format_number(value - current, self.precision)
+            if len(relative_text) < len(text):
+                text = relative_text
+        self._write(text)
+        if letter == u'H':
+            self.x = value
+        else:
+            self.y = value
+
+    def curve_to(self, x1, y1, x2, y2, x, y):
+        self._command(u'C', (x1, y1, x2, y2, x, y))
+
+    def smooth_curve_to(self, x2, y2, x, y):
+        self._command(u'S', (x2, y2, x, y))
+
+    def quad_to(self, x1, y1, x, y):
+        self._command(u'Q', (x1, y1, x, y))
+
+    def arc_to(self, rx, ry, rotation, arc, sweep, x, y):
+        prefix = u'%s,%s %s %d,%d ' % (format_number(rx, self.precision), format_number(ry, self.precision),
+                                       format_number(rotation, self.precision), int(bool(arc)), int(bool(sweep)))
+        self._command(u'A', (x, y), prefix)
+
+    def close(self):
+        self._write(u'Z')
+        self.x = self.start_x
+        self.y = self.start_y
+
+    def write_path_array(self, path_array):
+        """Writes a PathArray, rounding its whole coordinate buffer at once"""
+        coords = np.round(path_array.coords, self.precision).tolist()
+        for code, o in zip(path_array.codes.tolist(), path_array.offsets.tolist()):
+            if code == MOVE:
+                self.move_to(coords[o], coords[o + 1])
+            elif code == LINE:
+                self.line_to(coords[o], coords[o + 1])
+            elif code == CUBIC:
+                self.curve_to(*coords[o:o + 6])
+            elif code == QUAD:
+                self.quad_to(*coords[o:o + 4])
+            elif code == ARC:
+                self.arc_to(*coords[o:o + 7])
+            elif code == CLOSE:
+                self.close()
+        return self
+
+    def commands(self):
+        """The commands written so far, one string each"""
+        value = self.buffer.getvalue()
+        ends = self.offsets[1:] + [len(value)]
+        return [value[start:end] for start, end in zip(self.offsets, ends)]
+
+    def getvalue(self):
+        """The path data; command letters need no separator"""
+        return self.buffer.getvalue()
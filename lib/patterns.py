@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import hashlib
+import io
+import os
+
+import diskcache
+import palette
+
+# Shared registry for the color pattern tiles (data/<color>.png) that color
+# pages fill shapes with. Each tile is read and encoded once per process, and
+# encodings are cached on disk by a hash of the file so later builds skip the
+# work. Modes:
+#   inline      the tile as a base64 data URI, as pages always did
+#   href        a path to the tile relative to the output svg; nothing embedded
+#   downsample  a smaller copy of the tile as a data URI, drawn at full size
+#   generate    a tile generated for the file's color name (see palette.py) at a dpi
+#   vector      a small svg tile of the color name instead of a bitmap
+
+MODES = ["inline", "href", "downsample", "generate", "vector"]
+TILE_SIZE = 100
+# size in points that pages draw pattern tiles at
+PATTERN_SIZE = 300
+
+class PatternCache(diskcache.DiskCache):
+
+    extension = "b64"
+
+    def __init__(self, directory=None, maxEntries=64):
+        diskcache.DiskCache.__init__(self, directory, maxEntries)
+        # file hashes by path, mtime and size so each file is hashed once
+        self.hashes = {}
+
+    def encode(self, filename, tileSize=None):
+        with open(filename, "rb") as f:
+            data = f.read()
+        if tileSize:
+            from PIL import Image
+            im = Image.open(io.BytesIO(data))
+            im = im.resize((tileSize, tileSize), Image.LANCZOS)
+            out = io.BytesIO()
+            im.save(out, "PNG", optimize=True)
+            data = out.getvalue()
+        return "data:image/png;base64,%s" % base64.b64encode(data)
+
+    def hash(self, filename):
+        stat = os.stat(filename)
+        fileKey = "%s:%s:%s" % (os.path.abspath(filename), stat.st_mtime, stat.st_size)
+        if fileKey not in self.hashes:
+            with open(filename, "rb") as f:
+                self.hashes[fileKey] = hashlib.sha1(f.read()).hexdigest()
+        return self.hashes[fileKey]
+
+    def href(self, filename, mode="inline", outputFile=None, tileSize=TILE_SIZE, dpi=palette.DPI):
+        if mode not in MODES:
+            raise ValueError("Unknown pattern mode: %s" % mode)
+        if mode in ("generate", "vector"):
+            # tiles are named after their palette color, e.g. data/lime.png
+            color = os.path.splitext(os.path.basename(filename))[0]
+            return palette.getTileHref(color, PATTERN_SIZE, dpi if mode == "generate" else 0, self.directory)
+        if mode == "href":
+            if outputFile is None:
+                return filename
+            return os.path.relpath(os.path.abspath(filename), os.path.dirname(os.path.abspath(outputFile)))
+        if mode == "inline":
+            tileSize = None
+        key = "%s_%s" % (self.hash(filename), tileSize or "full")
+        value = self.get(key)
+        if value is None:
+            value = self.encode(filename, tileSize)
+            # a full size tile is as quick to encode again as to read back
+            self.put(key, value, persist=bool(tileSize))
+        return value
+
+def getCache(directory=None):
+    return diskcache.getCache(PatternCache, directory)
+
+def getPatternHref(filename, mode="inline", outputFile=None, cacheDir=None, tileSize=TILE_SIZE, dpi=palette.DPI):
+    return getCache(cacheDir).href(filename, mode, outputFile, tileSize, dpi)
@@ -36,6 +36,7 @@ SOFTWARE.
 ================================
 '''
 
+from heapq import heapify, heappop, heappush
 from numpy import array, argmin
 import numpy as np
 
@@ -94,23 +95,113 @@ def remove(s,i):
 
 class VWSimplifier(object):
 
-    def __init__(self,pts):
+    def __init__(self,pts,thresholds=None):
         '''Initialize with points. takes some time to build
         the thresholds but then all threshold filtering later
-        is ultra fast'''
+        is ultra fast.  Pass thresholds computed earlier for the
+        same points (see simplifycache) to skip building them.'''
         self.pts = np.array(pts)
-        self.thresholds = self.build_thresholds()
-        self.ordered_thresholds = sorted(self.thresholds,reverse=True)
+        if thresholds is None:
+          thresholds = self.build_thresholds()
+        self.thresholds = np.asarray(thresholds)
+        self._ordered_thresholds = None
+
+    @property
+    def ordered_thresholds(self):
+        if self._ordered_thresholds is None:
+          self._ordered_thresholds = sorted(self.thresholds,reverse=True)
+        return self._ordered_thresholds
+
+    def nth_threshold(self,n):
+        '''same as ordered_thresholds[n] but O(n) with np.partition'''
+        n = int(n)
+        size = len(self.thresholds)
+        if n >= size or n < -size:
+          raise IndexError("threshold index out of range")
+        k = size-1-(n % size)
+        return np.partition(self.thresholds,k)[k]
 
     def build_thresholds(self):
         '''compute the area value of each vertex, which one would
         use to mask an array of points for any threshold value.
 
+        Vertices live in a doubly linked list and candidates in a
+        heap keyed by (area, index); entries made stale by a neighbour
+        update are skipped when popped.  O(n log n), and the result is
+        identical to build_thresholds_argmin.
+
         returns a numpy.array (length of pts)  of the areas.
         '''
         pts = self.pts
         nmax = len(pts)
         real_areas = triangle_areas_from_array(pts)
+        if nmax < 3:
+          return real_areas
+
+        p = pts.tolist()
+        areas = real_areas.tolist()
+        prev_idx = range(-1,nmax-1)
+        next_idx = range(1,nmax+1)
+        removed = [False]*nmax
+        last = nmax-1
+
+        heap = [(a,idx) for idx,a in enumerate(areas) if a<np.inf]
+        heapify(heap)
+
+        skip = None
+        while True:
+           if skip is None:
+             #pop until we find an entry that is still current
+             idx = None
+             while heap:
+               a,j = heappop(heap)
+               if not removed[j] and a == areas[j]:
+                 idx = j
+                 break
+             if idx is None:
+               break
+           else:
+             #a neighbour was raised to this_area; remove it next,
+             # exactly like the argmin version does
+             idx = skip
+             skip = None
+           this_area = areas[idx]
+           if this_area == np.inf:
+             break
+
+           removed[idx] = True
+           left = prev_idx[idx]
+           right = next_idx[idx]
+           next_idx[left] = right
+           prev_idx[right] = left
+
+           if right != last:
+             right_area = triangle_area(p[left],p[right],p[next_idx[right]])
+             if right_area <= this_area:
+                 #same justification as in build_thresholds_argmin
+                 right_area = this_area
+                 skip = right
+             areas[right] = right_area
+             heappush(heap,(right_area,right))
+
+           if left != 0:
+             left_area = triangle_area(p[prev_idx[left]],p[left],p[right])
+             if left_area <= this_area:
+                 left_area = this_area
+                 skip = left
+             areas[left] = left_area
+             heappush(heap,(left_area,left))
+
+        return np.array(areas,dtype=real_areas.dtype)
+
+    def build_thresholds_argmin(self):
+        '''original O(n^2) implementation, which rescans the whole
+        area array with argmin after each removal.  Kept as the
+        reference for build_thresholds.
+        '''
+        pts = self.pts
+        nmax = len(pts)
+        real_areas = triangle_areas_from_array(pts)
         real_indices = range(nmax)
 
 
@@ -194,9 +285,8 @@ class VWSimplifier(object):
         return self.pts[self.thresholds >= threshold]
 
     def from_number(self,n):
-        thresholds = self.ordered_thresholds
         try:
-          threshold = thresholds[int(n)]
+          threshold = self.nth_threshold(n)
         except IndexError:
           return self.pts
         return self.pts[self.thresholds > threshold]
@@ -431,8 +521,36 @@ def fancy_parametric(k):
     yt = lambda t: (k-1)*sin(t) - sin(t*(k-1))
     return xt,yt
 
+def benchmark(filenames):
+   '''time the heap and argmin threshold builders on the largest
+   ring of each shapefile/geojson, at increasing vertex counts'''
+   from time import time
+   from geojson import GeoJSONUtil
+   for filename in filenames:
+     rings = [ring for shapes in GeoJSONUtil(filename).shapes for ring in shapes]
+     ring = np.array(max(rings,key=len),dtype=float)[:,:2]
+     print "%s (%s vertices in largest ring)"%(filename,len(ring))
+     print "%10s %12s %12s %8s"%("vertices","heap (s)","argmin (s)","same")
+     n = len(ring)
+     sizes = sorted(set([max(n//k,3) for k in (16,8,4,2,1)]))
+     for size in sizes:
+       simplifier = VWSimplifier(ring[:size])
+       start = time()
+       heap = simplifier.build_thresholds()
+       heap_time = time()-start
+       start = time()
+       ref = simplifier.build_thresholds_argmin()
+       argmin_time = time()-start
+       print "%10s %12.4f %12.4f %8s"%(size,heap_time,argmin_time,np.array_equal(heap,ref))
+
 if __name__ == "__main__":
 
+   import sys
+   if len(sys.argv) > 1:
+     # e.g. python polysimplify.py ../sea_ice/data/extent_N_201609_polygon_v2/extent_N_201609_polygon_v2.shp
+     benchmark(sys.argv[1:])
+     sys.exit()
+
    from time import time
    n = 5000
    thetas = np.linspace(0,16*np.pi,n)
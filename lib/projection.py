@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+import math
+import numpy as np
+
+# Specify the parameters of the Regional Conformal spatial ref.system using Lambert's Conformal Conic projection method
+# Format: [central meridian, latitude or origin, 1st standard parallel, 2nd standard parallel, false easting, false northing]
+PROJ_PARAMS = {
+    "USA": ['-96.0','39.0','33.0','45.0','0.0','0.0'],
+    "Asia": ['105.0','0.0','30.0','62.0','0.0','0.0'],
+    "Europe": ['10.0','30.0','43.0','62.0','0.0','0.0'],
+    "SA": ['-60.0','-32.0','-5.0','-42.0','0.0','0.0']
+}
+
+# Proj objects are expensive to create, so keep one per preset
+PROJECTIONS = {}
+
+def getProjection(preset):
+    if preset not in PROJECTIONS:
+        from pyproj import Proj
+        proj = PROJ_PARAMS[preset]
+        PROJECTIONS[preset] = Proj(ellps='GRS80',proj='lcc',lon_0=proj[0],lat_0=proj[1],lat_1=proj[2],lat_2=proj[3],x_0=proj[4],y_0=proj[5])
+    return PROJECTIONS[preset]
+
+def norm(values, a, b):
+    return 1.0 * (values - a) / (b - a)
+
+def project(lngs, lats, preset):
+    # project whole arrays of lng/lat using LCC in one call
+    lccProj = getProjection(preset)
+    (x, y) = lccProj(np.asarray(lngs, dtype=np.float64), np.asarray(lats, dtype=np.float64))
+    return (np.asarray(x), np.asarray(y))
+
+def projectNormalized(lngs, lats, preset):
+    # returns x,y normalized to 0-1 with y pointing south
+    (x, y) = project(lngs, lats, preset)
+    xn = norm(x, x.min(), x.max())
+    yn = norm(y, y.max(), y.min())
+    return (xn, yn)
+
+def mercator(radians):
+    return np.log(np.tan(radians*0.5 + math.pi*0.25))
+
+# http://stackoverflow.com/questions/2651099/convert-long-lat-to-pixel-x-y-on-a-given-picture
+def mercatorToPixels(lngs, lats, w, h, bounds):
+    west = math.radians(bounds[0])
+    south = math.radians(bounds[1])
+    east = math.radians(bounds[2])
+    north = math.radians(bounds[3])
+
+    ymin = math.log(math.tan(south*0.5 + math.pi*0.25))
+    ymax = math.log(math.tan(north*0.5 + math.pi*0.25))
+    xFactor = 1.0 * w / (east - west)
+    yFactor = 1.0 * h / (ymax - ymin)
+
+    x = np.radians(np.asarray(lngs, dtype=np.float64))
+    y = mercator(np.radians(np.asarray(lats, dtype=np.float64)))
+    x = (x - west) * xFactor
+    y = (ymax - y) * yFactor # y points south
+    return (x, y)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import numpy as np
+import zipfile
+
+import diskcache
+from polysimplify import VWSimplifier
+
+# Caches Visvalingam-Whyatt thresholds by a hash of the geometry so a ring
+# only has to be ranked once; simplifying to any target afterwards is a mask.
+class ThresholdCache(diskcache.DiskCache):
+
+    extension = "npz"
+    readErrors = diskcache.DiskCache.readErrors + (KeyError, zipfile.BadZipfile)
+
+    def __init__(self, directory=".vwcache", maxBytes=64*1024*1024, maxEntries=512):
+        diskcache.DiskCache.__init__(self, directory, maxEntries, maxBytes)
+
+    def key(self, pts):
+        pts = np.ascontiguousarray(pts, dtype=np.float64)
+        h = hashlib.sha1(str(pts.shape))
+        h.update(pts.tostring())
+        return h.hexdigest()
+
+    def read(self, filename):
+        with np.load(filename) as npz:
+            return npz["thresholds"]
+
+    def simplifier(self, pts):
+        pts = np.array(pts, dtype=np.float64)
+        key = self.key(pts)
+        thresholds = self.get(key)
+        if thresholds is not None and len(thresholds) == len(pts):
+            return VWSimplifier(pts, thresholds=thresholds)
+        simplifier = VWSimplifier(pts)
+        self.put(key, simplifier.thresholds)
+        return simplifier
+
+    def write(self, f, thresholds):
+        np.savez(f, thresholds=thresholds)
+
+def getCache(directory=".vwcache"):
+    return diskcache.getCache(ThresholdCache, directory)
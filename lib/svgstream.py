@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+from contextlib import contextmanager
+
+# Writes SVG elements straight to a buffered file as they are generated
+# instead of building a whole svgwrite.Drawing in memory. The output is
+# laid out like svgwrite's: sorted attributes, defs first, underscores in
+# attribute names written as hyphens.
+
+HEADER = '<?xml version="1.0" encoding="utf-8" ?>\n'
+NAMESPACES = 'xmlns="http://www.w3.org/2000/svg" xmlns:ev="http://www.w3.org/2001/xml-events" xmlns:xlink="http://www.w3.org/1999/xlink"'
+
+def escapeText(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def escapeAttribute(text):
+    return escapeText(text).replace("\"", "&quot;").replace("\n", "&#10;")
+
+def toString(value):
+    if isinstance(value, unicode):
+        return value.encode("utf-8")
+    if isinstance(value, (list, tuple)):
+        return " ".join([toString(v) for v in value])
+    return str(value)
+
+def pointsString(points):
+    return " ".join(["%s,%s" % (toString(x), toString(y)) for (x, y) in points])
+
+class SVGStream(object):
+
+    def __init__(self, filename, size, bufferSize=1024*1024):
+        self.filename = filename
+        self.f = open(filename, "wb", bufferSize)
+        self.stack = []
+        # the last start tag is left open until we know whether it has children
+        self.open = False
+        self.defsWritten = False
+        (width, height) = size
+        self.f.write(HEADER)
+        self.f.write('<svg baseProfile="full" height="%s" version="1.1" width="%s" %s>' % (toString(height), toString(width), NAMESPACES))
+
+    def attributes(self, attrs):
+        names = []
+        for name, value in attrs.items():
+            if value is None:
+                continue
+            name = name.rstrip("_").replace("_", "-")
+            if name == "href":
+                name = "xlink:href"
+            names.append((name, value))
+        return "".join([' %s="%s"' % (name, escapeAttribute(toString(value))) for name, value in sorted(names)])
+
+    def beforeElement(self):
+        if self.open:
+            self.f.write(">")
+            self.open = False
+        # svgwrite always writes defs as the first child, empty or not
+        if not self.defsWritten and not self.stack:
+            self.f.write("<defs />")
+            self.defsWritten = True
+
+    def element(self, tag, text=None, **attrs):
+        self.beforeElement()
+        if text is None:
+            self.f.write("<%s%s />" % (tag, self.attributes(attrs)))
+        else:
+            self.f.write("<%s%s>%s</%s>" % (tag, self.attributes(attrs), escapeText(toString(text)), tag))
+
+    def start(self, tag, **attrs):
+        self.beforeElement()
+        self.f.write("<%s%s" % (tag, self.attributes(attrs)))
+        self.stack.append(tag)
+        self.open = True
+
+    def end(self):
+        tag = self.stack.pop()
+        if self.open:
+            # empty elements are self-closed like svgwrite writes them
+            self.f.write(" />")
+            self.open = False
+        else:
+            self.f.write("</%s>" % tag)
+
+    @contextmanager
+    def defs(self):
+        self.defsWritten = True
+        self.start("defs")
+        yield self
+        self.end()
+
+    @contextmanager
+    def group(self, **attrs):
+        self.start("g", **attrs)
+        yield self
+        self.end()
+
+    @contextmanager
+    def pattern(self, size=None, **attrs):
+        if size is not None:
+            (attrs["width"], attrs["height"]) = size
+        self.start("pattern", **attrs)
+        yield self
+        self.end()
+
+    def circle(self, center=(0, 0), r=1, **attrs):
+        self.element("circle", cx=center[0], cy=center[1], r=r, **attrs)
+
+    def ellipse(self, center=(0, 0), r=(1, 1), **attrs):
+        self.element("ellipse", cx=center[0], cy=center[1], rx=r[0], ry=r[1], **attrs)
+
+    def image(self, href, insert=None, size=None, **attrs):
+        if insert is not None:
+            (attrs["x"], attrs["y"]) = insert
+        if size is not None:
+            (attrs["width"], attrs["height"]) = size
+        self.element("image", href=href, **attrs)
+
+    def path(self, d=None, **attrs):
+        self.element("path", d=d, **attrs)
+
+    def polygon(self, points=[], **attrs):
+        self.element("polygon", points=pointsString(points), **attrs)
+
+    def rect(self, insert=(0, 0), size=(1, 1), **attrs):
+        self.element("rect", x=insert[0], y=insert[1], width=size[0], height=size[1], **attrs)
+
+    def text(self, text, insert=None, **attrs):
+        if insert is not None:
+            (attrs["x"], attrs["y"]) = insert
+        self.element("text", text, **attrs)
+
+    def use(self, href, insert=None, **attrs):
+        if insert is not None:
+            (attrs["x"], attrs["y"]) = insert
+        self.element("use", href=href, **attrs)
+
+    def save(self):
+        self.beforeElement()
+        while self.stack:
+            self.end()
+        self.f.write("</svg>")
+        self.f.close()
@@ -1,8 +1,15 @@
 # -*- coding: utf-8 -*-
 
+import iconcache
+import io
 import math
-from path import Arc, CubicBezier, Line, parse_path, QuadraticBezier
+import os
+from path import parse_path_array, PathWriter
 import re
+try:
+    import xml.etree.cElementTree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 
 # Utility functions
 
@@ -46,13 +53,138 @@ def describeArc(x, y, rx, ry, startAngle, endAngle):
     sweepFlag = 0
     if startAngle > endAngle:
         sweepFlag = 1
-    d = [
-        "M%s,%s" % start,
-        "A%s,%s,%s,%s,%s,%s,%s" % (rx, ry, 0, largeArcFlag, sweepFlag, end[0], end[1])
-    ]
-    return d
+    writer = PathWriter()
+    writer.move_to(*start)
+    writer.arc_to(rx, ry, 0, largeArcFlag, sweepFlag, end[0], end[1])
+    return writer.commands()
+
+def getDataFromSVG(filename, cacheDir=None):
+    # icons are read once per process, and once per build if given a cache directory
+    entry = iconcache.getCache(readDataFromSVG, cacheDir).get(filename)
+    # copy the lists so callers can't change the cached entry; path arrays are shared, copy before transforming
+    return dict(entry, paths=list(entry["paths"]), polygons=list(entry["polygons"]))
+
+SHAPE_TAGS = ("path", "polygon", "polyline", "circle")
+SVG_NAMESPACE = "http://www.w3.org/2000/svg"
+# start tags of the root and of shapes, and attributes, for scanning files without an XML parser
+ROOT_PATTERN = re.compile(r'<(?:\w+:)?svg\s([^>]*)>')
+SHAPE_PATTERN = re.compile(r'<(?:\w+:)?(path|polygon|polyline|circle)\s([^>]*)>')
+ATTRIBUTE_PATTERN = re.compile(r'([\w:\-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+COMMENT_PATTERN = re.compile(r'<!--.*?-->', re.S)
+
+def newSVGData():
+    return {
+        "x": 0, "y": 0, "width": 0, "height": 0,
+        "paths": [], "polygons": [], "polylines": [], "circles": [],
+        "transforms": {"paths": [], "polygons": [], "polylines": [], "circles": []}
+    }
+
+def readDataFromSVG(filename, tags=SHAPE_TAGS, limit=None):
+    """Collects shape geometry from an SVG file and the transforms that apply
+    to each shape; stops after limit shapes if given"""
+    source = filename
+    if not limit:
+        with open(filename, 'rb') as f:
+            contents = f.read()
+        # a full read of a file without transforms or entities is quickest as a regular expression scan
+        if "transform" not in contents and "&" not in contents:
+            data = scanDataFromSVG(contents, tags)
+            checkSVGData(filename, data, tags)
+            return data
+        source = io.BytesIO(contents)
+    return parseDataFromSVG(filename, source, tags, limit)
+
+def scanDataFromSVG(contents, tags=SHAPE_TAGS):
+    data = newSVGData()
+    if "<!--" in contents:
+        contents = COMMENT_PATTERN.sub("", contents)
+    match = ROOT_PATTERN.search(contents)
+    if match:
+        readSVGDimensions(readAttributes(match.group(1)), data)
+    for tag, attributes in SHAPE_PATTERN.findall(contents):
+        if tag not in tags:
+            continue
+        attributes = readAttributes(attributes)
+        if tag == "circle":
+            value = tuple([float(attributes.get(a, 0)) for a in ("cx", "cy", "r")])
+        else:
+            value = attributes.get("points" if tag != "path" else "d")
+            if not value:
+                continue
+        key = tag + "s"
+        data[key].append(value)
+        data["transforms"][key].append(None)
+    return data
+
+def readAttributes(text):
+    attributes = {}
+    for name, double, single in ATTRIBUTE_PATTERN.findall(text):
+        value = double or single
+        # white space in attribute values becomes spaces, as an XML parser does
+        if "\n" in value or "\r" in value or "\t" in value:
+            value = value.replace("\r\n", " ").replace("\r", " ").replace("\n", " ").replace("\t", " ")
+        attributes[name] = value
+    return attributes
 
-def getDataFromSVG(filename):
+def parseDataFromSVG(filename, source, tags=SHAPE_TAGS, limit=None):
+    # streams elements, keeping the transforms of the open elements
+    data = newSVGData()
+    # shape tags to collect, with and without the svg namespace
+    shapeTags = {}
+    for tag in set(tags) & set(SHAPE_TAGS):
+        shapeTags[tag] = shapeTags["{%s}%s" % (SVG_NAMESPACE, tag)] = tag
+    transforms = []
+    found = 0
+    try:
+        for event, element in ET.iterparse(source, events=("start", "end")):
+            if event == "end":
+                transforms.pop()
+                element.clear()
+                continue
+            transforms.append(element.get("transform"))
+            if len(transforms) == 1:
+                readSVGDimensions(element, data)
+            elif element.tag in shapeTags:
+                tag = shapeTags[element.tag]
+                if tag == "circle":
+                    value = tuple([float(element.get(a, 0)) for a in ("cx", "cy", "r")])
+                else:
+                    value = element.get("points" if tag != "path" else "d")
+                    if not value:
+                        continue
+                key = tag + "s"
+                data[key].append(value)
+                data["transforms"][key].append(" ".join([t for t in transforms if t]) or None)
+                found += 1
+                if limit and found >= limit:
+                    break
+    except ET.ParseError as e:
+        print "Warning: couldn't parse %s (%s), reading it with regular expressions" % (filename, e)
+        return scrapeDataFromSVG(filename)
+    checkSVGData(filename, data, tags)
+    return data
+
+def checkSVGData(filename, data, tags):
+    if not data["width"]:
+        print "Warning: could not find dimensions for %s" % filename
+    if not data["paths"] and "path" in tags:
+        print "Warning: couldn't find paths in %s" % filename
+
+def readSVGDimensions(element, data):
+    viewBox = element.get("viewBox")
+    if viewBox:
+        values = [float(v) for v in viewBox.replace(",", " ").split()]
+        if len(values) == 4:
+            (data["x"], data["y"], data["width"], data["height"]) = values
+            return
+    # no view box: use the size, ignoring any units
+    for key in ("width", "height"):
+        match = re.match(r"[0-9\.]+", element.get(key, ""))
+        if match:
+            data[key] = float(match.group(0))
+
+def scrapeDataFromSVG(filename):
+    # the original regular expression reader, for files that aren't well-formed XML
     paths = []
     polygons = []
     width = 0
@@ -81,26 +213,29 @@ def getDataFromSVG(filename):
 
     # return data
     return {
+        "x": 0,
+        "y": 0,
         "width": width,
         "height": height,
         "paths": paths,
-        "polygons": polygons
+        "polygons": polygons,
+        "polylines": [],
+        "circles": [],
+        "transforms": {"paths": [None] * len(paths), "polygons": [None] * len(polygons), "polylines": [], "circles": []}
     }
 
-def getDataFromSVGs(filenames):
+def getDataFromSVGs(filenames, cacheDir=None):
     data = []
     for filename in filenames:
-        fileData = getDataFromSVG(filename)
+        fileData = getDataFromSVG(filename, cacheDir)
         data.append(fileData)
     return data
 
-def getParsedDataFromSVG(filename):
-    svgData = getDataFromSVG(filename)
-    parsedPaths = []
-    for path in svgData["paths"]:
-        parsedPath = parsePath(path)
-        parsedPaths.append(parsedPath)
-    svgData["paths"] = parsedPaths
+def getParsedDataFromSVG(filename, cacheDir=None):
+    svgData = getDataFromSVG(filename, cacheDir)
+    if svgData["pathArrays"] is None:
+        raise ValueError("Couldn't parse paths in %s: %s" % (filename, svgData.get("pathError")))
+    svgData["paths"] = [pathArray.commands() for pathArray in svgData["pathArrays"]]
     return svgData
 
 # SVG parameter functions
@@ -116,70 +251,44 @@ def getTransformString(w, h, x, y, sx=1, sy=1, r=0):
     return transform
 
 def parsePath(d):
-    path = parse_path(d)
-    commands = []
-    if len(path):
-        commands.append(["M", (path[0].start.real, path[0].start.imag)])
-    for p in path:
-        if isinstance(p, CubicBezier):
-            commands.append(["C", (p.control1.real, p.control1.imag), (p.control2.real, p.control2.imag), (p.end.real, p.end.imag)])
-
-        elif isinstance(p, Line):
-            commands.append(["L", (p.end.real, p.end.imag)])
-
-        elif isinstance(p, QuadraticBezier):
-            commands.append(["Q", (p.control.real, p.control.imag), (p.end.real, p.end.imag)])
-    if path.closed:
-        commands.append(["Z"])
-    return commands
+    # commands are read off the path's coordinate buffer; each subpath starts with its own M
+    return parse_path_array(d).commands()
 
 def patternDiagonal(size, direction="up"):
-    commands = [
-        "M0,%s" % size,
-        "l%s,-%s" % (size, size),
-        "M-%s,%s" % (size*0.25, size*0.25),
-        "l%s,-%s" % (size*0.5, size*0.5),
-        "M%s,%s" % (size*0.75, size*1.25),
-        "l%s,-%s" % (size*0.5, size*0.5)
-    ]
+    writer = PathWriter()
     if direction=="down":
-        commands = [
-            "M0,0",
-            "l%s,%s" % (size, size),
-            "M-%s,%s" % (size*0.25, size*0.75),
-            "l%s,%s" % (size*0.5, size*0.5),
-            "M%s,-%s" % (size*0.75, size*0.25),
-            "l%s,%s" % (size*0.5, size*0.5)
-        ]
-    return commands
+        writer.move_to(0, 0)
+        writer.line_to(size, size)
+        writer.move_to(-size*0.25, size*0.75)
+        writer.line_to(size*0.25, size*1.25)
+        writer.move_to(size*0.75, -size*0.25)
+        writer.line_to(size*1.25, size*0.25)
+    else:
+        writer.move_to(0, size)
+        writer.line_to(size, 0)
+        writer.move_to(-size*0.25, size*0.25)
+        writer.line_to(size*0.25, -size*0.25)
+        writer.move_to(size*0.75, size*1.25)
+        writer.line_to(size*1.25, size*0.75)
+    return writer.commands()
 
 def patternDiamond(size=24, dotSize=8):
     dotR = dotSize / 2
     dotC = size / 2
-    commands = [
-        "M0,0",
-        "L%s,%s" % (0, dotR),
-        "L%s,%s" % (dotR, 0),
-        "Z",
-        "M%s,%s" % (size, 0),
-        "L%s,%s" % (size, dotR),
-        "L%s,%s" % (size-dotR, 0),
-        "Z",
-        "M%s,%s" % (0, size),
-        "L%s,%s" % (dotR, size),
-        "L%s,%s" % (0, size-dotR),
-        "Z",
-        "M%s,%s" % (size, size),
-        "L%s,%s" % (size-dotR, size),
-        "L%s,%s" % (size, size-dotR),
-        "Z",
-        "M%s,%s" % (dotC, dotC-dotR),
-        "L%s,%s" % (dotC-dotR, dotC),
-        "L%s,%s" % (dotC, dotC+dotR),
-        "L%s,%s" % (dotC+dotR, dotC),
-        "Z"
+    shapes = [
+        [(0, 0), (0, dotR), (dotR, 0)],
+        [(size, 0), (size, dotR), (size-dotR, 0)],
+        [(0, size), (dotR, size), (0, size-dotR)],
+        [(size, size), (size-dotR, size), (size, size-dotR)],
+        [(dotC, dotC-dotR), (dotC-dotR, dotC), (dotC, dotC+dotR), (dotC+dotR, dotC)]
     ]
-    return commands
+    writer = PathWriter()
+    for shape in shapes:
+        writer.move_to(*shape[0])
+        for point in shape[1:]:
+            writer.line_to(*point)
+        writer.close()
+    return writer.commands()
 
 def patternWater(width=24, height=36, waveHeight=12):
     w = width
@@ -188,24 +297,23 @@ def patternWater(width=24, height=36, waveHeight=12):
     hw = width * 0.5
     offsetH = (h - wh * 2) * 0.5
     hh = h - offsetH
-    commands = [
-        "M%s,%s" % (0,0),
-        "C%s,%s %s,%s %s,%s" % (0, wh, w, wh, w, 0),
-        "M-%s,%s" % (hw, hh-wh),
-        "C-%s,%s %s,%s %s,%s" % (hw, hh, hw, hh, hw, hh-wh),
-        "M%s,%s" % (hw, hh-wh),
-        "C%s,%s %s,%s %s,%s" % (hw, hh, w+hw, hh, w+hw, hh-wh)
-    ]
-    return commands
+    writer = PathWriter()
+    writer.move_to(0, 0)
+    writer.curve_to(0, wh, w, wh, w, 0)
+    writer.move_to(-hw, hh-wh)
+    writer.curve_to(-hw, hh, hw, hh, hw, hh-wh)
+    writer.move_to(hw, hh-wh)
+    writer.curve_to(hw, hh, w+hw, hh, w+hw, hh-wh)
+    return writer.commands()
 
 # convert points to curve
 # recommended curviness range: 0.1 - 0.5
 def pointsToCurve(points, curviness=0.3):
-    commands = []
+    writer = PathWriter()
     for i, point in enumerate(points):
         # first point: move to point
         if i <= 0:
-            commands.append("M%s,%s" % point)
+            writer.move_to(*point)
         else:
             # get previous and next point
             p0 = points[i-1]
@@ -222,27 +330,46 @@ def pointsToCurve(points, curviness=0.3):
                 if i <= 1:
                     a0 = angleBetweenPoints(p0, point)
                     cp0 = translatePoint(p0, a0, cpd)
-                    commands.append("C%s,%s %s,%s %s,%s" % flattenTuples([cp0, cp2, point]))
+                    writer.curve_to(*flattenTuples([cp0, cp2, point]))
                 # otherwise, shorthand curve to
                 else:
-                    commands.append("S%s,%s %s,%s" % flattenTuples([cp2, point]))
+                    writer.smooth_curve_to(*flattenTuples([cp2, point]))
             # last point
             else:
                 a2 = angleBetweenPoints(point, p0)
                 cp2 = translatePoint(point, a2, cpd)
-                commands.append("S%s,%s %s,%s" % flattenTuples([cp2, point]))
-    return commands
+                writer.smooth_curve_to(*flattenTuples([cp2, point]))
+    return writer.commands()
 
 def scalePath(d, scale):
-    commands = parsePath(d)
-    path = []
-    for command in commands:
-        points = ["%s,%s" % (round(xy[0]*scale, 3), round(xy[0]*scale, 3)) for xy in command[1:]]
-        path.append(command[0] + " ".join(points))
-    return path
+    pathArray = parse_path_array(d).scale(scale)
+    return PathWriter(relative=False).write_path_array(pathArray).commands()
 
 def scalePaths(paths, scale):
     sPaths = []
     for path in paths:
         sPaths.append(scalePath(path, scale))
     return sPaths
+
+def benchmarkSVGReaders(filenames, repeat=20):
+    from time import time
+    size = sum([os.path.getsize(f) for f in filenames]) * repeat / (1024.0 * 1024.0)
+    print "%s files, %.2fMB" % (len(filenames) * repeat, size)
+    readers = [
+        ("regex", scrapeDataFromSVG),
+        ("readDataFromSVG", readDataFromSVG),
+        ("iterparse", lambda f: parseDataFromSVG(f, f)),
+        ("iterparse, first path", lambda f: readDataFromSVG(f, ("path",), 1))
+    ]
+    for name, reader in readers:
+        start = time()
+        for i in range(repeat):
+            for filename in filenames:
+                reader(filename)
+        elapsed = time() - start
+        print "  %s: %.3fs, %.2fMB/s" % (name, elapsed, size / elapsed)
+
+if __name__ == "__main__":
+    # e.g. python svgutils.py ../transport/svg/*.svg
+    import sys
+    benchmarkSVGReaders(sys.argv[1:])
@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+from ..dpsimplify import DPSimplifier
+
+
+def grid_line(seed, size=200):
+    # a random walk on an integer grid, like contours traced from a raster
+    rs = np.random.RandomState(seed)
+    steps = rs.randint(-1, 2, size=(size - 1, 2))
+    return np.vstack([[0, 0], np.cumsum(steps, axis=0)]).astype(np.float64)
+
+
+class FromNumberTest(unittest.TestCase):
+
+    def test_tied_thresholds(self):
+        for seed in range(20):
+            pts = grid_line(seed)
+            simplifier = DPSimplifier(pts)
+            for n in (2, 3, 10, 50, 199, 200):
+                simplified = simplifier.from_number(n)
+                self.assertEqual(len(simplified), n)
+
+    def test_keeps_end_points(self):
+        pts = grid_line(1)
+        simplified = DPSimplifier(pts).from_number(5)
+        self.assertEqual(simplified[0].tolist(), pts[0].tolist())
+        self.assertEqual(simplified[-1].tolist(), pts[-1].tolist())
+
+    def test_hierarchy(self):
+        # every smaller simplification is contained in a larger one
+        pts = grid_line(2)
+        simplifier = DPSimplifier(pts)
+        previous = set()
+        for n in range(2, 60):
+            kept = set(map(tuple, simplifier.from_number(n).tolist()))
+            self.assertTrue(previous <= kept)
+            previous = kept
+
+    def test_matches_threshold(self):
+        pts = grid_line(3)
+        simplifier = DPSimplifier(pts)
+        for tolerance in (0.5, 2.0, 5.0):
+            expected = simplifier.from_threshold(tolerance)
+            self.assertEqual(simplifier.from_number(len(expected)).tolist(), expected.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@
 # Example usage:
 #   python make_ebook.py -basedir ../../Dropbox/coloring_book/book/
 #   python make_ebook.py -basedir ../../Dropbox/coloring_book/book/ -printing False -manifests sequence_default_text
+#   python make_ebook.py -basedir ../../Dropbox/coloring_book/book/ -build build/manifest.json
 
 import argparse
 import csv
@@ -22,6 +23,7 @@ parser.add_argument('-outputdir', dest="OUTPUT_DIR", default="compiled/", help="
 parser.add_argument('-width', dest="WIDTH", type=float, default=8.5, help="Width of pdf")
 parser.add_argument('-height', dest="HEIGHT", type=float, default=11.0, help="Height of pdf")
 parser.add_argument('-printing', dest="FOR_PRINTING", type=bool, default=True, help="Include other printable pdfs")
+parser.add_argument('-build', dest="BUILD_MANIFEST", default="", help="Manifest written by build.py; stop if any page in it is out of date")
 
 # init input
 args = parser.parse_args()
@@ -36,6 +38,16 @@ FOR_PRINTING = args.FOR_PRINTING
 WIDTH = args.WIDTH
 HEIGHT = args.HEIGHT
 
+# make sure the rendered pages are current before compiling them
+if len(args.BUILD_MANIFEST):
+    import build
+    stale = build.stalePages(args.BUILD_MANIFEST)
+    if len(stale):
+        for name, reason in stale:
+            print "Page %s is out of date: %s" % (name, reason)
+        print "Run python build.py and export the changed pages first"
+        sys.exit(1)
+
 # ensure output dir exists
 if not os.path.exists(OUTPUT_DIR):
     os.makedirs(OUTPUT_DIR)
@@ -12,17 +12,15 @@
 import argparse
 import csv
 from datetime import datetime
-import inspect
 import json
 import math
 import os
 from pprint import pprint
 import sys
 
-# add parent directory to sys path to import relative modules
-currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
-parentdir = os.path.dirname(currentdir)
-sys.path.insert(0,parentdir)
+# add parent directory to sys path to import relative modules when run as a script
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import lib.mathutils as mu
 
@@ -36,107 +34,113 @@ parser.add_argument('-y0', dest="YEAR_START", type=int, default=1951, help="Year
 parser.add_argument('-y1', dest="YEAR_END", type=int, default=2015, help="Year end")
 parser.add_argument('-data', dest="DATA_FILE", default="data/nuisance.json", help="Path to output data file to cache data")
 
-# init input
-args = parser.parse_args()
-STATIONS = args.STATIONS.split(",")
-YEAR_START = args.YEAR_START
-YEAR_END = args.YEAR_END
-
-def readCSV(filename):
-    data = []
-    if os.path.isfile(filename):
-        with open(filename, 'rb') as f:
-            reader = csv.DictReader(f, skipinitialspace=True)
-            data = list(reader)
-    return data
-
-# read nuisance csv
-nuisanceData = readCSV(args.NUISANCE_INPUT)
-stationData = {}
-for d in nuisanceData:
-    stationId = d["St. ID"]
-    if stationId in STATIONS:
-        stationData[stationId] = {
-            "label": d["NOAA Tide Gauge"],
-            "nuisanceLevel": float(d["Nuisance Flood Level (above MHHW)"])
-        }
-print "Retrieved %s stations: %s" % (len(stationData.keys()), stationData.keys())
-
-# Retrieve sea level data
-for stationId in STATIONS:
-    station = stationData[stationId]
-    slrData = readCSV(args.SEA_LEVEL_INPUT % stationId)
-    years = {}
-    for year in range(YEAR_START, YEAR_END+1):
-        years[year] = { "data": [] }
-    for d in slrData:
-        year = int(d["Year"])
-        if year in years.keys():
-            value = d["Monthly_MSL"]
-            if len(value):
-                value = float(value)
-                years[year]["data"].append(value)
-            elif len(d["Linear_Trend"]):
-                value = float(d["Linear_Trend"])
-                years[year]["data"].append(value)
-            # else:
-            #     print "Warning: %s at %s-%s has no slr value" % (stationId, year, d["Month"])
-    for year in years:
-        years[year]["mean"] = mu.mean(years[year]["data"])
-        if not len(years[year]["data"]):
-            print "Warning: no slr data in station(%s) and year(%s)" % (stationId, year)
-    # normalize SLR to minumum year
-    minMean = min([d["mean"] for year, d in years.iteritems()])
-    data = []
-    for year in years:
-        if len(years[year]["data"]):
-            data.append({"year": int(year), "value": years[year]["mean"] - minMean})
-        else:
-            data.append({"year": int(year), "value": -1})
-    stationData[stationId]["slrData"] = data
-print "Processed mean sea level data"
-
-# Retrieve inundation data
-for stationId in STATIONS:
-    station = stationData[stationId]
-    inundationData = readCSV(args.INUNDATION_INPUT % stationId)
-    years = {}
-    for year in range(YEAR_START, YEAR_END+1):
-        years[year] = { "days": [] }
-    for d in inundationData:
-        dateStart = datetime.strptime(d["Period Start"], '%Y-%m-%d %H:%M')
-        dateEnd = datetime.strptime(d["Period End"], '%Y-%m-%d %H:%M')
-        year = dateStart.year
-        if year >= YEAR_START and dateEnd.year <= YEAR_END:
-            value = d["Elevation (Meters) Above Datum"]
-            if len(value) and value != "--":
-                value = float(value)
-                day = dateStart.strftime("%Y-%m-%d")
-                if value > station["nuisanceLevel"] and day not in years[year]["days"]:
-                    years[year]["days"].append(day)
-    data = []
-    for year in years:
-        data.append({"year": int(year), "value": len(years[year]["days"])})
-    stationData[stationId]["inundationData"] = data
-print "Processed inundation data"
-
-# Calculate stats
-for stationId in stationData:
-    station = stationData[stationId]
-    slrData = [d["value"] for d in station["slrData"] if d["value"] >= 0]
-    inundationData = [d["value"] for d in station["inundationData"] if d["value"] >= 0]
-    stationData[stationId]["slrRange"] = (min(slrData), max(slrData))
-    stationData[stationId]["inundationRange"] = (min(inundationData), max(inundationData))
-
-# Find ranges
-slrData = [d["slrRange"][0] for stationId, d in stationData.iteritems()] + [d["slrRange"][1] for stationId, d in stationData.iteritems()]
-inundationData = [d["inundationRange"][0] for stationId, d in stationData.iteritems()] + [d["inundationRange"][1] for stationId, d in stationData.iteritems()]
-data = {
-    "stationData": stationData,
-    "slrRange": [min(slrData), max(slrData)],
-    "inundationRange": [min(inundationData), max(inundationData)]
-}
-
-with open(args.DATA_FILE, 'w') as f:
-    json.dump(data, f)
-    print "Wrote data to %s" % args.DATA_FILE
+def build(config=None):
+    # init input
+    args = parser.parse_args([])
+    args.__dict__.update(config or {})
+    STATIONS = args.STATIONS.split(",")
+    YEAR_START = args.YEAR_START
+    YEAR_END = args.YEAR_END
+
+    def readCSV(filename):
+        data = []
+        if os.path.isfile(filename):
+            with open(filename, 'rb') as f:
+                reader = csv.DictReader(f, skipinitialspace=True)
+                data = list(reader)
+        return data
+
+    # read nuisance csv
+    nuisanceData = readCSV(args.NUISANCE_INPUT)
+    stationData = {}
+    for d in nuisanceData:
+        stationId = d["St. ID"]
+        if stationId in STATIONS:
+            stationData[stationId] = {
+                "label": d["NOAA Tide Gauge"],
+                "nuisanceLevel": float(d["Nuisance Flood Level (above MHHW)"])
+            }
+    print "Retrieved %s stations: %s" % (len(stationData.keys()), stationData.keys())
+
+    # Retrieve sea level data
+    for stationId in STATIONS:
+        station = stationData[stationId]
+        slrData = readCSV(args.SEA_LEVEL_INPUT % stationId)
+        years = {}
+        for year in range(YEAR_START, YEAR_END+1):
+            years[year] = { "data": [] }
+        for d in slrData:
+            year = int(d["Year"])
+            if year in years.keys():
+                value = d["Monthly_MSL"]
+                if len(value):
+                    value = float(value)
+                    years[year]["data"].append(value)
+                elif len(d["Linear_Trend"]):
+                    value = float(d["Linear_Trend"])
+                    years[year]["data"].append(value)
+                # else:
+                #     print "Warning: %s at %s-%s has no slr value" % (stationId, year, d["Month"])
+        for year in years:
+            years[year]["mean"] = mu.mean(years[year]["data"])
+            if not len(years[year]["data"]):
+                print "Warning: no slr data in station(%s) and year(%s)" % (stationId, year)
+        # normalize SLR to minumum year
+        minMean = min([d["mean"] for year, d in years.iteritems()])
+        data = []
+        for year in years:
+            if len(years[year]["data"]):
+                data.append({"year": int(year), "value": years[year]["mean"] - minMean})
+            else:
+                data.append({"year": int(year), "value": -1})
+        stationData[stationId]["slrData"] = data
+    print "Processed mean sea level data"
+
+    # Retrieve inundation data
+    for stationId in STATIONS:
+        station = stationData[stationId]
+        inundationData = readCSV(args.INUNDATION_INPUT % stationId)
+        years = {}
+        for year in range(YEAR_START, YEAR_END+1):
+            years[year] = { "days": [] }
+        for d in inundationData:
+            dateStart = datetime.strptime(d["Period Start"], '%Y-%m-%d %H:%M')
+            dateEnd = datetime.strptime(d["Period End"], '%Y-%m-%d %H:%M')
+            year = dateStart.year
+            if year >= YEAR_START and dateEnd.year <= YEAR_END:
+                value = d["Elevation (Meters) Above Datum"]
+                if len(value) and value != "--":
+                    value = float(value)
+                    day = dateStart.strftime("%Y-%m-%d")
+                    if value > station["nuisanceLevel"] and day not in years[year]["days"]:
+                        years[year]["days"].append(day)
+        data = []
+        for year in years:
+            data.append({"year": int(year), "value": len(years[year]["days"])})
+        stationData[stationId]["inundationData"] = data
+    print "Processed inundation data"
+
+    # Calculate stats
+    for stationId in stationData:
+        station = stationData[stationId]
+        slrData = [d["value"] for d in station["slrData"] if d["value"] >= 0]
+        inundationData = [d["value"] for d in station["inundationData"] if d["value"] >= 0]
+        stationData[stationId]["slrRange"] = (min(slrData), max(slrData))
+        stationData[stationId]["inundationRange"] = (min(inundationData), max(inundationData))
+
+    # Find ranges
+    slrData = [d["slrRange"][0] for stationId, d in stationData.iteritems()] + [d["slrRange"][1] for stationId, d in stationData.iteritems()]
+    inundationData = [d["inundationRange"][0] for stationId, d in stationData.iteritems()] + [d["inundationRange"][1] for stationId, d in stationData.iteritems()]
+    data = {
+        "stationData": stationData,
+        "slrRange": [min(slrData), max(slrData)],
+        "inundationRange": [min(inundationData), max(inundationData)]
+    }
+
+    with open(args.DATA_FILE, 'w') as f:
+        json.dump(data, f)
+        print "Wrote data to %s" % args.DATA_FILE
+    return [args.DATA_FILE]
+
+if __name__ == "__main__":
+    build(vars(parser.parse_args()))
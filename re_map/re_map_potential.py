@@ -99,7 +99,7 @@ statesGeo.rejectFeatures(GEOJSON_KEY, "District of Columbia")
 (w,h) = statesGeo.getDimensions()
 statesHeight = 1.0 * WIDTH * h / w
 padY = PAD + HEIGHT - statesHeight
-statePolys = statesGeo.toPolygons(WIDTH, PAD, padY)
+statePolys = statesGeo.toTopoPolygons(WIDTH, PAD, padY)
 stateNames = statesGeo.getProperties(GEOJSON_KEY)
 statePolyDict = dict(zip(stateNames, statePolys))
 
@@ -1,52 +1,63 @@
 # -*- coding: utf-8 -*-
 
-import inspect
+import argparse
 import math
 import os
 import svgwrite
 import sys
 
-# add parent directory to sys path to import relative modules
-currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
-parentdir = os.path.dirname(currentdir)
-sys.path.insert(0,parentdir)
+# add parent directory to sys path to import relative modules when run as a script
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import lib.svgutils as svgu
 
-# Config
-DPI = 72
-WIDTH = 7.5 * DPI
-HEIGHT = 7.5 * DPI
-OUTPUT_FILE = 'thank-you.svg'
-INPUT_FILE = 'badge.svg'
-COUNT = 829
-COLS = 26
-ROWS = int(math.ceil(1.0 * COUNT / 26))
-SCALE = 0.67
-
-cell = min(1.0 * WIDTH / COLS, 1.0 * HEIGHT / ROWS)
-cellR = cell * 0.5
-
-# Init SVG
-dwg = svgwrite.Drawing(OUTPUT_FILE, size=(WIDTH, HEIGHT), profile='full')
-
-# Backer ref
-data = svgu.getDataFromSVG(INPUT_FILE)
-dwgBacker = dwg.g(id="backer")
-for path in data["paths"]:
-    dwgBacker.add(dwg.path(d=path, stroke_width=1.5, stroke="#000000", fill="#FFFFFF"))
-dwg.defs.add(dwgBacker)
-
-# Draw forests
-x = 0
-y = 0
-for backer in range(COUNT):
-    t = "translate(%s, %s) scale(%s)" % (x,y,SCALE)
-    dwg.add(dwg.use("#backer", insert=(0,0), transform=t))
-    x += cell
-    if x >= (cell*COLS):
-        x = 0
-        y += cell
-
-dwg.save()
-print "Saved svg: %s" % OUTPUT_FILE
+# input
+parser = argparse.ArgumentParser()
+parser.add_argument('-output', dest="OUTPUT_FILE", default="thank-you.svg", help="Path to output svg file")
+
+def build(config=None):
+    args = parser.parse_args([])
+    args.__dict__.update(config or {})
+
+    # Config
+    DPI = 72
+    WIDTH = 7.5 * DPI
+    HEIGHT = 7.5 * DPI
+    OUTPUT_FILE = args.OUTPUT_FILE
+    INPUT_FILE = 'badge.svg'
+    COUNT = 829
+    COLS = 26
+    ROWS = int(math.ceil(1.0 * COUNT / 26))
+    SCALE = 0.67
+
+    cell = min(1.0 * WIDTH / COLS, 1.0 * HEIGHT / ROWS)
+    cellR = cell * 0.5
+
+    # Init SVG
+    dwg = svgwrite.Drawing(OUTPUT_FILE, size=(WIDTH, HEIGHT), profile='full')
+
+    # Backer ref
+    data = svgu.getDataFromSVG(INPUT_FILE)
+    dwgBacker = dwg.g(id="backer")
+    for path in data["paths"]:
+        dwgBacker.add(dwg.path(d=path, stroke_width=1.5, stroke="#000000", fill="#FFFFFF"))
+    dwg.defs.add(dwgBacker)
+
+    # Draw forests
+    x = 0
+    y = 0
+    for backer in range(COUNT):
+        t = "translate(%s, %s) scale(%s)" % (x,y,SCALE)
+        dwg.add(dwg.use("#backer", insert=(0,0), transform=t))
+        x += cell
+        if x >= (cell*COLS):
+            x = 0
+            y += cell
+
+    dwg.save()
+    print "Saved svg: %s" % OUTPUT_FILE
+    return [OUTPUT_FILE]
+
+if __name__ == "__main__":
+    build(vars(parser.parse_args()))